@@ -0,0 +1,268 @@
+# tilastoseuranta/analytics.py
+
+"""Confidence intervals for pass statistics
+
+Pass percentages of single players come from small samples. The functions
+in this module give bootstrap or Wilson score intervals for every team and
+player of one game or a whole season at once. Passes are integer coded into
+NumPy arrays, and the bootstrap draws all resamples of all groups in one
+batched binomial or multinomial call, which is the exact resampling
+distribution of a proportion or of a mean over a small set of values.
+
+Teams are identified by name and players by team name and player number,
+so the same player is followed over several games.
+
+Functions:
+    - 'encode_passes(games)': integer coded passes of the games
+    - 'wilson_interval(successes, totals, confidence)': Wilson score intervals of proportions
+    - 'bootstrap_proportion_interval(successes, totals, resamples, confidence, rng)': bootstrap intervals of proportions
+    - 'bootstrap_mean_interval(counts, values, resamples, confidence, rng)': bootstrap intervals of means
+    - 'pass_pct_intervals(games, method, resamples, confidence, seed)': intervals of team and player pass %
+    - 'chain_length_intervals(games, resamples, confidence, seed)': intervals of team mean pass chain length
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+
+from classes import Pass
+
+def encode_passes(games:list) -> dict:
+    """Returns passes of the games as integer coded arrays
+
+    A player is identified by team name and player number as in the
+    statistics store, so the passes of a player whose name changes between
+    games get the same code. The latest name is kept.
+
+    Args:
+        games: list of games (Game)
+
+    Returns:
+        dict with keys
+            teams (list): team names, index is the team code
+            players (list): (team name, player number, latest name), index is the player code
+            games (int): number of games, also those without passes
+            game (ndarray): game index of each pass
+            team (ndarray): team code of the passing team
+            player (ndarray): player code of the passing player
+            receiver (ndarray): player code of the receiving player, -1 if out
+            target (ndarray): pass target, 1 own team, 0 opponent, 2 out
+    """
+    teams = {}
+    players = {}
+    names = {}
+    game_codes, team_codes, player_codes, receiver_codes, targets = [], [], [], [], []
+
+    for game_index, game in enumerate(games):
+        for team in [game.home_team, game.away_team]:
+            teams.setdefault(team.name, len(teams))
+            for player in team.players:
+                players.setdefault((team.name, player.player_number), len(players))
+                names[(team.name, player.player_number)] = player.name
+
+        for event in game.events:
+            if not isinstance(event, Pass):
+                continue
+            passing_player = event.passing_player
+            game_codes.append(game_index)
+            team_codes.append(teams[passing_player.team.name])
+            player_codes.append(players[(passing_player.team.name, passing_player.player_number)])
+            if event.receiving_player == 'out':
+                receiver_codes.append(-1)
+            else:
+                receiving_player = event.receiving_player
+                receiver_codes.append(players[(receiving_player.team.name, receiving_player.player_number)])
+            targets.append(event.target)
+
+    return {
+        'teams': list(teams),
+        'players': [(team, number, names[(team, number)]) for team, number in players],
+        'games': len(games),
+        'game': np.array(game_codes, dtype=np.int32),
+        'team': np.array(team_codes, dtype=np.int32),
+        'player': np.array(player_codes, dtype=np.int32),
+        'receiver': np.array(receiver_codes, dtype=np.int32),
+        'target': np.array(targets, dtype=np.int8),
+    }
+
+def _z(confidence:float) -> float:
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+def wilson_interval(successes, totals, confidence:float=0.95) -> tuple:
+    """Returns Wilson score intervals of proportions
+
+    Examples:
+        >>> low, high = wilson_interval([8], [10])
+        >>> print(f"{low[0]:.3f} {high[0]:.3f}")
+        0.490 0.943
+
+    Args:
+        successes: number of successes of each group
+        totals: number of trials of each group
+        confidence: confidence level (default: 0.95)
+
+    Returns:
+        arrays (low, high), 0 and 1 for groups without trials
+    """
+    successes = np.asarray(successes, dtype=float)
+    totals = np.asarray(totals, dtype=float)
+    z = _z(confidence)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        p = successes / totals
+        denominator = 1 + z**2 / totals
+        center = (p + z**2 / (2 * totals)) / denominator
+        half_width = z * np.sqrt(p * (1 - p) / totals + z**2 / (4 * totals**2)) / denominator
+
+    empty = totals == 0
+    return np.where(empty, 0.0, center - half_width), np.where(empty, 1.0, center + half_width)
+
+def bootstrap_proportion_interval(successes, totals, resamples:int=10000, confidence:float=0.95, rng=None) -> tuple:
+    """Returns percentile bootstrap intervals of proportions
+
+    Resampling n outcomes of a group with k successes gives Binomial(n, k/n)
+    successes, so all resamples of all groups are drawn in one call.
+
+    Args:
+        successes: number of successes of each group
+        totals: number of trials of each group
+        resamples: number of bootstrap resamples (default: 10000)
+        confidence: confidence level (default: 0.95)
+        rng: numpy.random.Generator (default: new unseeded generator)
+
+    Returns:
+        arrays (low, high), 0 and 1 for groups without trials
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    successes = np.asarray(successes, dtype=np.int64)
+    totals = np.asarray(totals, dtype=np.int64)
+    safe_totals = np.maximum(totals, 1)
+
+    samples = rng.binomial(totals[:, None], (successes / safe_totals)[:, None], size=(len(totals), resamples))
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(samples / safe_totals[:, None], [alpha, 1 - alpha], axis=1)
+
+    empty = totals == 0
+    return np.where(empty, 0.0, low), np.where(empty, 1.0, high)
+
+def bootstrap_mean_interval(counts, values, resamples:int=10000, confidence:float=0.95, rng=None) -> tuple:
+    """Returns percentile bootstrap intervals of means over a small set of values
+
+    Each group is given as a histogram over common values. Resampling n
+    observations of a group is a multinomial draw over its histogram, so all
+    resamples of all groups are drawn in one call.
+
+    Args:
+        counts: 2d array, number of observations of each value (columns) per group (rows)
+        values: the values the columns stand for
+        resamples: number of bootstrap resamples (default: 10000)
+        confidence: confidence level (default: 0.95)
+        rng: numpy.random.Generator (default: new unseeded generator)
+
+    Returns:
+        arrays (low, high), nan for groups without observations
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    counts = np.asarray(counts, dtype=np.int64)
+    values = np.asarray(values, dtype=float)
+    totals = counts.sum(axis=1)
+    safe_totals = np.maximum(totals, 1)
+
+    pvals = counts / safe_totals[:, None]
+    pvals[totals == 0, 0] = 1 # any valid distribution, result is masked below
+    samples = rng.multinomial(totals, pvals, size=(resamples, len(totals)))
+    means = samples @ values / safe_totals
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha], axis=0)
+
+    empty = totals == 0
+    return np.where(empty, np.nan, low), np.where(empty, np.nan, high)
+
+def pass_pct_intervals(games:list, method:str='bootstrap', resamples:int=10000, confidence:float=0.95, seed:int=None) -> dict:
+    """Returns pass % and its confidence interval for every team and player
+
+    Args:
+        games: list of games (Game)
+        method: 'bootstrap' or 'wilson' (default: 'bootstrap')
+        resamples: number of bootstrap resamples (default: 10000)
+        confidence: confidence level (default: 0.95)
+        seed: random seed of the bootstrap (default: None)
+
+    Returns:
+        dict with keys
+            teams: {team name: (passes, pass %, low, high)}
+            players: {(team name, player number): (passes, pass %, low, high)}
+    """
+    encoded = encode_passes(games)
+    successful = encoded['target'] == 1
+
+    groups = []
+    for key, labels, codes in [
+            ('teams', encoded['teams'], encoded['team']),
+            ('players', [(team, number) for team, number, _ in encoded['players']], encoded['player'])]:
+        totals = np.bincount(codes, minlength=len(labels))
+        successes = np.bincount(codes, weights=successful, minlength=len(labels)).astype(np.int64)
+        groups.append((key, labels, totals, successes))
+
+    # Teams and players are resampled in the same batch
+    totals = np.concatenate([group[2] for group in groups])
+    successes = np.concatenate([group[3] for group in groups])
+    if method == 'wilson':
+        low, high = wilson_interval(successes, totals, confidence)
+    elif method == 'bootstrap':
+        low, high = bootstrap_proportion_interval(successes, totals, resamples, confidence, np.random.default_rng(seed))
+    else:
+        raise ValueError(f"Unknown method: {method}")
+    pct = successes / np.maximum(totals, 1)
+
+    intervals = {}
+    offset = 0
+    for key, labels, _, _ in groups:
+        intervals[key] = {
+            label: (int(totals[i]), float(pct[i]), float(low[i]), float(high[i]))
+            for label, i in zip(labels, range(offset, offset + len(labels)))}
+        offset += len(labels)
+    return intervals
+
+def chain_length_intervals(games:list, resamples:int=10000, confidence:float=0.95, seed:int=None) -> dict:
+    """Returns mean pass chain length of every team and its bootstrap interval
+
+    A chain is a run of consecutive passes to own team by the same team as in
+    'Game.passing_chains'. Chains do not continue from one game to the next.
+
+    Args:
+        games: list of games (Game)
+        resamples: number of bootstrap resamples (default: 10000)
+        confidence: confidence level (default: 0.95)
+        seed: random seed of the bootstrap (default: None)
+
+    Returns:
+        dict {team name: (chains, mean chain length, low, high)}
+    """
+    encoded = encode_passes(games)
+    teams = encoded['teams']
+
+    # Run-length encoding of the own team passes, runs are broken by game boundaries
+    code = np.where(encoded['target'] == 1, encoded['team'], -1)
+    new_game = np.diff(encoded['game'], prepend=-1) != 0
+    run_start = new_game | (np.diff(code, prepend=-2) != 0)
+    starts = np.flatnonzero(run_start)
+    lengths = np.diff(np.append(starts, len(code)))
+    run_teams = code[starts]
+
+    chains = run_teams >= 0
+    lengths, run_teams = lengths[chains], run_teams[chains]
+
+    values = np.arange(1, lengths.max() + 1) if len(lengths) else np.arange(1, 2)
+    counts = np.zeros((len(teams), len(values)), dtype=np.int64)
+    np.add.at(counts, (run_teams, lengths - 1), 1)
+
+    totals = counts.sum(axis=1)
+    with np.errstate(invalid='ignore'):
+        means = counts @ values / totals
+    low, high = bootstrap_mean_interval(counts, values, resamples, confidence, np.random.default_rng(seed))
+
+    return {
+        team: (int(totals[i]), float(means[i]), float(low[i]), float(high[i]))
+        for i, team in enumerate(teams)}
@@ -0,0 +1,47 @@
+# tilastoseuranta/benchmarks/bench_analytics.py
+
+"""Benchmark of season-level confidence intervals in 'analytics'
+
+Run from the repository root:
+    python -m benchmarks.bench_analytics [games] [passes_per_game] [resamples]
+"""
+
+import sys
+from time import perf_counter
+
+from analytics import encode_passes, pass_pct_intervals, chain_length_intervals
+from benchmarks.synthetic import random_game
+
+def main(games:int=100, passes_per_game:int=400, resamples:int=10000):
+    """Computes intervals for a synthetic season and prints timings
+
+    Args:
+        games: number of games in the season
+        passes_per_game: passes in each game
+        resamples: number of bootstrap resamples
+    """
+    season = [random_game(n, passes_per_game, seed=n) for n in range(1, games + 1)]
+
+    start = perf_counter()
+    encode_passes(season)
+    print(f"Encoding: {games} games, {games * passes_per_game} passes in {perf_counter() - start:.3f} s")
+
+    start = perf_counter()
+    intervals = pass_pct_intervals(season, resamples=resamples, seed=1)
+    print(f"Pass % bootstrap, {resamples} resamples: {perf_counter() - start:.3f} s")
+
+    start = perf_counter()
+    pass_pct_intervals(season, method='wilson')
+    print(f"Pass % Wilson: {perf_counter() - start:.3f} s")
+
+    start = perf_counter()
+    chains = chain_length_intervals(season, resamples=resamples, seed=1)
+    print(f"Chain length bootstrap, {resamples} resamples: {perf_counter() - start:.3f} s")
+
+    for team, (passes, pct, low, high) in intervals['teams'].items():
+        chain_count, mean, chain_low, chain_high = chains[team]
+        print(f"{team}: {passes} syöttöä, {pct:.1%} ({low:.1%}-{high:.1%}), "
+              f"ketjun keskipituus {mean:.2f} ({chain_low:.2f}-{chain_high:.2f})")
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
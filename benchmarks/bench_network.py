@@ -0,0 +1,76 @@
+# tilastoseuranta/benchmarks/bench_network.py
+
+"""Benchmark of league-level pass network analytics in 'network'
+
+Passes are generated directly as integer coded arrays in the format of
+'analytics.encode_passes', because a league does not fit in 'game.json'.
+
+Run from the repository root:
+    python -m benchmarks.bench_network [teams] [players_per_team] [passes]
+"""
+
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from network import (season_adjacency_matrix, game_adjacency_matrices, degree_centrality,
+                     pagerank, pass_triangles, chain_paths)
+
+def random_league(teams:int, players_per_team:int, passes:int, games:int, seed:int=1) -> dict:
+    """Returns random passes of a league coded as in 'analytics.encode_passes'
+
+    Args:
+        teams: number of teams
+        players_per_team: number of players in a team
+        passes: total number of passes
+        games: number of games the passes are spread over
+        seed: random seed (default: 1)
+    """
+    rng = np.random.default_rng(seed)
+    team = rng.integers(0, teams, passes)
+    player = team * players_per_team + rng.integers(0, players_per_team, passes)
+    target = rng.choice(np.array([1, 0, 2], dtype=np.int8), passes, p=[0.75, 0.2, 0.05])
+    # Successful passes go to a teammate other than the passer
+    receiver = team * players_per_team + (player % players_per_team + rng.integers(1, players_per_team, passes)) % players_per_team
+    receiver = np.where(target == 1, receiver, np.where(target == 0, (receiver + players_per_team) % (teams * players_per_team), -1))
+    return {
+        'teams': list(range(teams)),
+        'players': list(range(teams * players_per_team)),
+        'games': games,
+        'game': np.sort(rng.integers(0, games, passes)).astype(np.int32),
+        'team': team.astype(np.int32),
+        'player': player.astype(np.int32),
+        'receiver': receiver.astype(np.int32),
+        'target': target,
+    }
+
+def timed(label:str, function, *args, **kwargs):
+    start = perf_counter()
+    result = function(*args, **kwargs)
+    print(f"{label}: {perf_counter() - start:.3f} s")
+    return result
+
+def main(teams:int=20, players_per_team:int=25, passes:int=2_000_000):
+    """Runs the network analytics for a random league and prints timings
+
+    Args:
+        teams: number of teams
+        players_per_team: number of players in a team
+        passes: total number of passes
+    """
+    games = teams * (teams - 1)
+    encoded = random_league(teams, players_per_team, passes, games)
+    print(f"{teams * players_per_team} pelaajaa, {passes} syöttöä, {games} peliä")
+
+    adjacency = timed("Season matrix", season_adjacency_matrix, encoded)
+    timed("Game matrices", game_adjacency_matrices, encoded)
+    timed("Degree centrality", degree_centrality, adjacency)
+    timed("PageRank", pagerank, adjacency)
+    triangles = timed("Triangles", pass_triangles, adjacency, top=5)
+    paths = timed("Chain paths (3 passes)", chain_paths, encoded, length=3, top=5)
+
+    print(f"Yleisin kolmio: {triangles[0]}, yleisin ketju: {paths[0]}")
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,115 @@
+# tilastoseuranta/benchmarks/bench_player_grid.py
+
+"""Benchmark of the canvas player grid against a button per player
+
+Startup builds the player area of both teams: the previous layout creates a
+ttk.Button with two bindings per player, the player grid draws one Canvas.
+Dispatch resolves a click to a Player: the previous layout reads the button
+text and searches the team, the player grid looks up the cell at the click
+position.
+
+A real Tk window is used when a display is available, otherwise the
+stand-in tkinter of 'benchmarks.headless', which measures only the Python
+side of both layouts.
+
+Run from the repository root:
+    python -m benchmarks.bench_player_grid [players_per_team] [clicks]
+"""
+
+import sys
+import random
+from time import perf_counter
+
+from benchmarks import headless
+
+def load_tkinter() -> tuple:
+    """Returns (tkinter module, root window, description)"""
+    import tkinter
+    try:
+        root = tkinter.Tk()
+        root.withdraw()
+        return tkinter, root, 'Tk'
+    except tkinter.TclError:
+        headless.install(lambda: None, headless.FakeClock())
+        tkinter = sys.modules['tkinter']
+        return tkinter, tkinter.Tk(), 'headless'
+
+def squad(name:str, players:int):
+    """Returns a team with players numbered 1..players"""
+    from classes import Team
+    team = Team(name)
+    team.add_players([f"{number} - Pelaaja" for number in range(1, players + 1)])
+    return team
+
+def button_layout(tkinter, frame, teams:list) -> list:
+    """Builds the previous layout of a ttk.Button with two bindings per player
+
+    Returns:
+        list of (button, team) for dispatch
+    """
+    buttons = []
+    for row, team in enumerate(teams):
+        for column, player in enumerate(team.players):
+            button = tkinter.ttk.Button(frame, text=player.player_number)
+            button.grid(column=column, row=2 * row + 1)
+            button.bind('<ButtonPress-1>', lambda e, team=team: team.get_player(e.widget.cget('text')))
+            button.bind('<ButtonPress-3>', lambda e, team=team: team.get_player(e.widget.cget('text')))
+            buttons.append((button, team))
+    for column, text in enumerate(["Sivurajalta\nulos", "Päätyrajalta\nulos"]):
+        button = tkinter.ttk.Button(frame, text=text)
+        button.bind('<ButtonPress-3>', lambda e: 'out')
+        button.grid(column=column, row=2 * len(teams) + 1)
+    return buttons
+
+def main(players_per_team:int=25, clicks:int=100_000):
+    """Prints startup and dispatch timings of both layouts
+
+    Args:
+        players_per_team: players in each team
+        clicks: number of dispatched clicks
+    """
+    tkinter, root, description = load_tkinter()
+    from playergrid import PlayerGrid
+
+    teams = [squad('Oranssit', players_per_team), squad('Valkoiset', players_per_team)]
+    print(f"{description}: {players_per_team} pelaajaa joukkueessa, {clicks} klikkausta")
+
+    start = perf_counter()
+    frame = tkinter.ttk.Frame(root)
+    buttons = button_layout(tkinter, frame, teams)
+    frame.grid(column=0, row=0)
+    if description == 'Tk':
+        root.update_idletasks()
+    button_startup = perf_counter() - start
+
+    start = perf_counter()
+    canvas = tkinter.Canvas(root, highlightthickness=0)
+    grid = PlayerGrid(canvas, teams, ["Sivurajalta\nulos", "Päätyrajalta\nulos"])
+    canvas.grid(column=0, row=1)
+    if description == 'Tk':
+        root.update_idletasks()
+    grid_startup = perf_counter() - start
+
+    print(f"Käynnistys: painikkeet {button_startup * 1000:.2f} ms, kanvaasi {grid_startup * 1000:.2f} ms")
+
+    rng = random.Random(1)
+    button_events = [rng.choice(buttons)[0] for _ in range(clicks)]
+    positions = [position for target, position in grid.positions.items() if not isinstance(target, str)]
+    grid_events = [headless.Event(canvas, *rng.choice(positions)) for _ in range(clicks)]
+
+    # Same lookup as the bound callbacks of the buttons
+    teams_of = dict(buttons)
+    start = perf_counter()
+    for button in button_events:
+        teams_of[button].get_player(button.cget('text'))
+    button_dispatch = (perf_counter() - start) / clicks
+
+    start = perf_counter()
+    for event in grid_events:
+        grid.target_at(event.x, event.y)
+    grid_dispatch = (perf_counter() - start) / clicks
+
+    print(f"Klikkaus pelaajaksi: painikkeet {button_dispatch * 1e6:.2f} µs, kanvaasi {grid_dispatch * 1e6:.2f} µs")
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
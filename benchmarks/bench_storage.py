@@ -0,0 +1,50 @@
+# tilastoseuranta/benchmarks/bench_storage.py
+
+"""Benchmark of bulk ingest and aggregate queries of 'storage.StatisticsStore'
+
+Run from the repository root:
+    python -m benchmarks.bench_storage [games] [passes_per_game]
+"""
+
+import sys
+from time import perf_counter
+
+from storage import StatisticsStore
+from benchmarks.synthetic import random_game
+
+def main(games:int=1000, passes_per_game:int=400):
+    """Ingests and queries synthetic games and prints timings
+
+    Args:
+        games: number of games to ingest
+        passes_per_game: passes in each game
+    """
+    season = [random_game(n, passes_per_game, seed=n) for n in range(1, games + 1)]
+
+    store = StatisticsStore()
+
+    start = perf_counter()
+    store.save_games(season)
+    ingest_time = perf_counter() - start
+    total_passes = games * passes_per_game
+    print(f"Ingest: {games} games, {total_passes} passes in {ingest_time:.2f} s "
+          f"({total_passes / ingest_time:.0f} passes/s)")
+
+    team_names = [season[0].home_team.name, season[0].away_team.name]
+    rounds = 100
+    start = perf_counter()
+    for _ in range(rounds):
+        for team_name in team_names:
+            store.team_pass_totals(team_name)
+            store.player_pass_totals(team_name)
+    query_time = (perf_counter() - start) / (rounds * len(team_names))
+    print(f"Team + player aggregates: {query_time * 1000:.2f} ms per team")
+
+    for team_name in team_names:
+        passes, own, opponent, out = store.team_pass_totals(team_name)
+        print(f"{team_name}: {passes} syöttöä, omille {own / passes:.1%}")
+
+    store.close()
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,208 @@
+# tilastoseuranta/benchmarks/headless.py
+
+"""Stand-in tkinter for running the app without a display
+
+'install(mainloop, clock)' puts a stand-in 'tkinter' module into sys.modules. When
+'ui' and 'gamestatistics' are imported after it, their module level code runs
+unchanged: widgets only remember their options, bindings and children,
+variables call their traces on 'set', and 'after' callbacks are handed to a
+'Scheduler' which runs them against a fake clock. 'Tk.mainloop' calls the
+given function, which plays the part of the real event loop.
+
+The module contains the following classes
+
+- 'FakeClock' - callable replacement for time.time
+- 'Scheduler' - 'after' callbacks ordered by fake clock time
+- 'Widget' - stand-in for every tkinter and ttk widget
+- 'Variable' - stand-in for StringVar and IntVar
+- 'Event' - stand-in for tkinter.Event
+"""
+
+import sys
+import heapq
+import types
+from itertools import count
+
+class FakeClock:
+    """Callable returning fake wall clock time in seconds"""
+
+    def __init__(self, now:float=1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+class Scheduler:
+    """'after' callbacks waiting for their fake clock time"""
+
+    def __init__(self, clock:FakeClock):
+        """
+        Args:
+            clock: fake clock the callbacks are scheduled against
+
+        Attributes:
+            pending (list): heap of (due time, order, callback)
+        """
+        self.clock = clock
+        self.pending = []
+        self._order = count()
+
+    def after(self, ms:int, callback, *args):
+        heapq.heappush(self.pending, (self.clock.now + ms / 1000, next(self._order), lambda: callback(*args)))
+
+    def next_due(self) -> float:
+        """Returns the fake clock time of the next callback, infinity if none"""
+        return self.pending[0][0] if self.pending else float('inf')
+
+    def run_next(self):
+        """Advances the clock to the next callback and runs it"""
+        due, _, callback = heapq.heappop(self.pending)
+        self.clock.now = max(self.clock.now, due)
+        callback()
+
+class Event:
+    """Event passed to bound callbacks"""
+
+    def __init__(self, widget, x:int=0, y:int=0):
+        self.widget = widget
+        self.x = x
+        self.y = y
+
+class Widget:
+    """Widget which remembers its options, bindings and children"""
+
+    scheduler = None
+    mainloop_function = None
+
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = dict(options)
+        self.bindings = {}
+        self.children = []
+        self.items = 0
+        if master is not None:
+            master.children.append(self)
+
+    def cget(self, option):
+        return self.options.get(option, '')
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    config = configure
+
+    def __getitem__(self, option):
+        return self.cget(option)
+
+    def __setitem__(self, option, value):
+        self.options[option] = value
+
+    def bind(self, sequence=None, func=None, add=None):
+        if func is not None:
+            self.bindings[sequence] = func
+
+    def winfo_children(self) -> list:
+        return list(self.children)
+
+    def grid(self, **options):
+        pass
+
+    grid_configure = grid
+    pack = grid
+
+    def after(self, ms:int, callback, *args):
+        Widget.scheduler.after(ms, callback, *args)
+
+    def state(self, states=None):
+        pass
+
+    def register(self, func):
+        return func.__name__
+
+    def title(self, text=None):
+        pass
+
+    def configure_style(self, *args, **kwargs):
+        pass
+
+    # Entry
+    def insert(self, index, text):
+        value = str(self.options.get('value', ''))
+        position = len(value) if index == 'end' else int(index)
+        self.options['value'] = value[:position] + str(text) + value[position:]
+
+    def delete(self, first, last=None):
+        value = str(self.options.get('value', ''))
+        first = int(first)
+        last = len(value) if last == 'end' else (first + 1 if last is None else int(last))
+        self.options['value'] = value[:first] + value[last:]
+
+    def get(self):
+        return self.options.get('value', '')
+
+    # Canvas
+    def _create(self, *args, **options):
+        self.items += 1
+        return self.items
+
+    create_line = create_rectangle = create_text = create_oval = _create
+
+    def delete_items(self, *items):
+        pass
+
+    def mainloop(self):
+        Widget.mainloop_function()
+
+class Variable:
+    """StringVar and IntVar which call their write traces on set"""
+
+    def __init__(self, master=None, value=None):
+        self.value = value
+        self.traces = []
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        for callback in self.traces:
+            callback('', '', 'write')
+
+    def trace_add(self, mode, callback):
+        self.traces.append(callback)
+
+def install(mainloop, clock:FakeClock) -> Scheduler:
+    """Installs stand-in 'tkinter' and 'tkinter.ttk' modules
+
+    Args:
+        mainloop: function run in place of Tk.mainloop
+        clock: fake clock for 'after' callbacks
+
+    Returns:
+        scheduler (Scheduler) of the 'after' callbacks
+    """
+    Widget.scheduler = Scheduler(clock)
+    Widget.mainloop_function = mainloop
+
+    tkinter = types.ModuleType('tkinter')
+    ttk = types.ModuleType('tkinter.ttk')
+
+    widgets = ['Tk', 'Canvas', 'Frame', 'Label', 'Button', 'Entry', 'Radiobutton', 'Style']
+    for name in widgets:
+        widget_class = type(name, (Widget,), {})
+        setattr(tkinter, name, widget_class)
+        setattr(ttk, name, widget_class)
+    # ttk.Style().configure takes a style name as the first argument
+    ttk.Style.configure = Widget.configure_style
+    # Canvas.delete removes items instead of text
+    tkinter.Canvas.delete = Widget.delete_items
+
+    tkinter.StringVar = tkinter.IntVar = Variable
+    tkinter.Event = Event
+    tkinter.N, tkinter.S, tkinter.E, tkinter.W = 'n', 's', 'e', 'w'
+    tkinter.ttk = ttk
+    tkinter.__all__ = widgets + ['StringVar', 'IntVar', 'Event', 'N', 'S', 'E', 'W']
+
+    sys.modules['tkinter'] = tkinter
+    sys.modules['tkinter.ttk'] = ttk
+    return Widget.scheduler
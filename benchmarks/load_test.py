@@ -0,0 +1,215 @@
+# tilastoseuranta/benchmarks/load_test.py
+
+"""Headless load test of the click-to-stats path
+
+The real 'ui' and 'gamestatistics' modules are imported on top of the
+stand-in tkinter of 'benchmarks.headless'. The stand-in mainloop starts the
+game and plays a simulated game against a fake clock: passes arrive at the
+given rate as a left click on the passing player's cell of the player grid
+canvas and a right click on the receiving player's cell, so every pass goes
+through the canvas bindings, 'create_pass_event', 'finalize_pass_event' and
+the ui stats updates exactly as in the app. 'after' callbacks of the game clock are run in between.
+
+Latency of each pass is reported per segment of game time. The run fails
+(exit status 1) if the mean latency of the last segment is more than
+'growth_limit' times that of the first segment, or if the mean latency of
+the last 'BUDGET_WINDOW' passes exceeds the latency budget, in which case the
+game is stopped at that point.
+
+Run from the repository root:
+    python -m benchmarks.load_test [--rates 5 50] [--minutes 90]
+"""
+
+import io
+import os
+import sys
+import random
+import argparse
+import contextlib
+from collections import deque
+from time import perf_counter
+
+from benchmarks import headless
+
+# Number of latest passes whose mean latency is compared to the budget
+BUDGET_WINDOW = 100
+
+class LoadReport:
+    """Per-pass latencies of one simulated game"""
+
+    def __init__(self, rate:float, segment_seconds:int):
+        """
+        Args:
+            rate: passes per second
+            segment_seconds: length of a reporting segment in game seconds
+
+        Attributes:
+            pass_latencies (list): (game second, latency in seconds) of each pass
+            tick_latencies (list): latencies of the game clock callbacks in seconds
+            stopped_at (int): game second when the latency budget was exceeded, None if not
+        """
+        self.rate = rate
+        self.segment_seconds = segment_seconds
+        self.pass_latencies = []
+        self.tick_latencies = []
+        self.stopped_at = None
+
+    def segments(self) -> list:
+        """Returns (segment start second, passes, mean ms, p95 ms, max ms) per segment"""
+        buckets = {}
+        for second, latency in self.pass_latencies:
+            buckets.setdefault(second // self.segment_seconds, []).append(latency * 1000)
+
+        rows = []
+        for segment, latencies in sorted(buckets.items()):
+            latencies.sort()
+            rows.append((
+                segment * self.segment_seconds,
+                len(latencies),
+                sum(latencies) / len(latencies),
+                latencies[int(0.95 * (len(latencies) - 1))],
+                latencies[-1]))
+        return rows
+
+    def growth(self) -> float:
+        """Returns mean latency of the last segment divided by that of the first"""
+        rows = self.segments()
+        if len(rows) < 2 or rows[0][2] == 0:
+            return 1.0
+        return rows[-1][2] / rows[0][2]
+
+    def print(self):
+        print(f"--- {self.rate:g} syöttöä/s ---")
+        print(f"{'min':>5} {'syötöt':>7} {'ka ms':>8} {'p95 ms':>8} {'max ms':>8}")
+        for start, passes, mean, p95, maximum in self.segments():
+            print(f"{start // 60:>5} {passes:>7} {mean:>8.3f} {p95:>8.3f} {maximum:>8.3f}")
+        if self.tick_latencies:
+            print(f"Kello: {len(self.tick_latencies)} päivitystä, "
+                  f"ka {sum(self.tick_latencies) / len(self.tick_latencies) * 1000:.3f} ms")
+        if self.stopped_at is not None:
+            print(f"Latenssibudjetti ylittyi, peli keskeytettiin minuutilla {self.stopped_at // 60}")
+        print(f"Kasvu ensimmäisestä viimeiseen jaksoon: {self.growth():.1f}x")
+
+def pass_targets(player_grid) -> tuple:
+    """Returns click positions for passing (left click) and receiving (right click)
+
+    Args:
+        player_grid: player grid (PlayerGrid) of the app
+
+    Returns:
+        lists of (target, (x, y)) for (passing players, receiving players and out of field)
+    """
+    receiving = list(player_grid.positions.items())
+    passing = [(target, position) for target, position in receiving if not isinstance(target, str)]
+    return passing, receiving
+
+def simulate_game(report:LoadReport, clock:headless.FakeClock, scheduler:headless.Scheduler,
+                  minutes:int, seed:int, budget_ms:float):
+    """Plays a game in place of Tk.mainloop
+
+    Args:
+        report: report to record latencies to
+        clock: fake clock used by gamestatistics
+        scheduler: scheduler of the 'after' callbacks
+        minutes: game length in minutes
+        seed: random seed of the clicks
+        budget_ms: mean latency of the last BUDGET_WINDOW passes which stops the game
+    """
+    gamestatistics = sys.modules['gamestatistics']
+    ui = sys.modules['ui']
+    gamestatistics.time = clock
+
+    # The finished game is not saved or exported
+    gamestatistics.STATISTICS_DATABASE = ':memory:'
+    gamestatistics.TIMESERIES_CSV = os.devnull
+
+    ui.e_game_total_time.delete(0, 'end')
+    ui.e_game_total_time.insert(0, str(minutes))
+    ui.b_game_start.cget('command')()
+
+    rng = random.Random(seed)
+    canvas = ui.c_player_grid
+    passing, receiving = pass_targets(gamestatistics.player_grid)
+    end = clock.now + minutes * 60
+    next_pass = clock.now + rng.expovariate(report.rate)
+    recent_latencies = deque(maxlen=BUDGET_WINDOW)
+    recent_total = 0
+
+    while min(next_pass, scheduler.next_due()) < end:
+        if scheduler.next_due() <= next_pass:
+            start = perf_counter()
+            scheduler.run_next()
+            report.tick_latencies.append(perf_counter() - start)
+            continue
+
+        clock.now = next_pass
+        next_pass += rng.expovariate(report.rate)
+
+        passer, (passer_x, passer_y) = rng.choice(passing)
+        receiver, (receiver_x, receiver_y) = rng.choice([r for r in receiving if r[0] is not passer])
+
+        start = perf_counter()
+        canvas.bindings['<ButtonPress-1>'](headless.Event(canvas, passer_x, passer_y))
+        canvas.bindings['<ButtonPress-3>'](headless.Event(canvas, receiver_x, receiver_y))
+        latency = perf_counter() - start
+
+        second = gamestatistics.g.game_timer
+        report.pass_latencies.append((second, latency))
+
+        if len(recent_latencies) == BUDGET_WINDOW:
+            recent_total -= recent_latencies[0]
+        recent_latencies.append(latency)
+        recent_total += latency
+        if len(recent_latencies) == BUDGET_WINDOW and recent_total / BUDGET_WINDOW * 1000 > budget_ms:
+            report.stopped_at = second
+            return
+
+def run(rate:float, minutes:int=90, segment_minutes:int=5, seed:int=1, budget_ms:float=10) -> LoadReport:
+    """Imports the app on the stand-in tkinter and plays one game
+
+    Args:
+        rate: passes per second
+        minutes: game length in minutes (default: 90)
+        segment_minutes: length of a reporting segment in minutes (default: 5)
+        seed: random seed of the clicks (default: 1)
+        budget_ms: mean latency of the last BUDGET_WINDOW passes which stops the game (default: 10)
+
+    Returns:
+        report (LoadReport) of the game
+    """
+    report = LoadReport(rate, segment_minutes * 60)
+    clock = headless.FakeClock()
+    scheduler = headless.install(
+        lambda: simulate_game(report, clock, scheduler, minutes, seed, budget_ms), clock)
+
+    for module in ['ui', 'gamestatistics']:
+        sys.modules.pop(module, None)
+
+    # The app prints its end of game summary when mainloop returns
+    with contextlib.redirect_stdout(io.StringIO()):
+        import gamestatistics
+
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rates', type=float, nargs='+', default=[5, 50], help='passes per second')
+    parser.add_argument('--minutes', type=int, default=90, help='game length in minutes')
+    parser.add_argument('--segment', type=int, default=5, help='reporting segment in minutes')
+    parser.add_argument('--budget', type=float, default=10, help='mean latency budget of the latest passes in ms')
+    parser.add_argument('--growth-limit', type=float, default=3, help='allowed latency growth, last vs. first segment')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    failed = False
+    for rate in args.rates:
+        report = run(rate, args.minutes, args.segment, args.seed, args.budget)
+        report.print()
+        sys.stdout.flush()
+        if report.stopped_at is not None or report.growth() > args.growth_limit:
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
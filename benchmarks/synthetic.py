@@ -0,0 +1,43 @@
+# tilastoseuranta/benchmarks/synthetic.py
+
+"""Synthetic games for benchmarks
+
+Benchmarks are run from the repository root, e.g.
+'python -m benchmarks.bench_storage', because 'Game' reads the team json
+files relative to the working directory.
+
+Functions:
+    - 'random_game(game_number, passes, seed)': game with randomly generated passes
+"""
+
+import random
+
+from classes import Game, GameEvent, Pass
+
+def random_game(game_number:int, passes:int, seed:int=None) -> Game:
+    """Returns a game read from 'game.json' with randomly generated passes
+
+    Args:
+        game_number: game number to set to the game
+        passes: number of passes to generate
+        seed: random seed (default: None)
+
+    Returns:
+        game (Game) whose events are time-ordered passes
+    """
+    rng = random.Random(seed)
+    game = Game('game.json')
+    game.game_number = game_number
+
+    players = game.home_team.players + game.away_team.players
+    total_seconds = game.total_game_time * game.periods * 60
+    for i in range(passes):
+        seconds = i * total_seconds // max(passes, 1)
+        passing_player = rng.choice(players)
+        if rng.random() < 0.05:
+            receiving_player = 'out'
+        else:
+            receiving_player = rng.choice([p for p in players if p is not passing_player])
+        game_event = GameEvent(f"{seconds // 60:02d}:{seconds % 60:02d}", passing_player)
+        game.add_event(Pass(game_event=game_event, receiving_player=receiving_player))
+    return game
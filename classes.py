@@ -14,9 +14,10 @@ The module contains the following classes
 import re
 import json
 from collections import Counter
-from itertools import groupby
 from time import time
 
+from query import EventIndex, Query
+
 class Game:
     """Game class
     """
@@ -27,7 +28,11 @@ class Game:
             game_number (int): game number id
             home_team (Team): home team of the game
             away_team (Team): away team of the game
-            events (list): all events of the game
+            events (tuple): all events of the game, read-only, added with add_event
+            index (EventIndex): bitmap indexes of the events
+            passes (list): passes of the game in time order
+            chains (dict): pass code -> [ongoing chain length, Counter of chain lengths, longest chain]
+            target_counts (dict): team -> Counter of pass targets of the team's passes
             total_game_time (int): total game time in minutes
             periods (int): number of periods in the game
 
@@ -71,23 +76,40 @@ class Game:
                 self.away_team = Team(game_details['away_team'], self)
                 self.away_team.add_players(team_json['players'])
 
-        self.events = []
+        self.index = EventIndex()
+        self.passes = []
+        self.chains = {}
+        self.target_counts = {}
 
         self.total_game_time = game_details['total_period_time_in_minutes']
         self.periods = game_details['periods']
 
         self.started = False
 
+    @property
+    def events(self) -> tuple:
+        return self.index.events
+
     def passing_chains(self, pass_transfer: str) -> tuple([Counter, int]):
-        """Modifies and returns pass-list to ordered Counter pass-list and
-        retruns longest pass_transfer_chain.
+        """Returns pass chain lengths of a pass code and the longest chain.
+
+        A chain is a run of consecutive passes with the code. The chains are
+        kept up to date by add_event, so this is a lookup, the ongoing chain
+        included.
 
-        # TODO: Fix doctests
         Examples:
-            >>> Game.passing_chains(self, "o1")
+            Passes with codes o1, v1, o0, o0, o1, o1
+
+            >>> game = Game('game.json')
+            >>> o, v = game.home_team.players, game.away_team.players
+            >>> for passer, receiver in [(o[0], o[1]), (v[0], v[1]), (o[0], v[0]), (o[1], v[1]), (o[0], o[1]), (o[1], o[0])]:
+            ...     game.add_event(Pass(GameEvent('00:10', passer), receiver))
+            >>> game.passing_chains("o1")
             (Counter({1: 1, 2: 1}), 2)
-            >>> Game.passing_chains(["o1", "v1", "o0", "o0", "o1", "o1"], "v1")
+            >>> game.passing_chains("v1")
             (Counter({1: 1}), 1)
+            >>> game.passing_chains("v2")
+            (Counter(), 0)
 
         Args:
             pass_transfer: type of pass, e.g. "o1" i.e o-teams passes to own team
@@ -96,21 +118,56 @@ class Game:
             counter-object, consisting of pass chain length vs. their quantity in the game
             longest pass chain
         """
+        if pass_transfer not in self.chains:
+            return Counter(), 0
+        _, chain_lengths, longest_pass_chain_length = self.chains[pass_transfer]
+        return Counter(chain_lengths), longest_pass_chain_length
 
-        pass_codes = [p.code() for p in self.get_passes()]
+    def add_event(self, event:'GameEvent'):
+        """Adds an event as the latest event of the game and indexes it
 
-        c = [len(list(quantity)) for chain_length, quantity in groupby(pass_codes, key=lambda x:x == pass_transfer) if chain_length]
-        longest_pass_chain_length = max(c) if len(c) > 0 else 0
-        return Counter(c), longest_pass_chain_length
+        Passing chains are updated as passes arrive: a pass continues the
+        ongoing chain of its code and ends the chains of all other codes.
+
+        Args:
+            event: game event, e.g. Pass
+        """
+        self.index.add(event)
+        if not isinstance(event, Pass):
+            return
+        self.passes.append(event)
+        self.target_counts.setdefault(event.passing_player.team, Counter())[event.target] += 1
+
+        pass_code = event.code()
+        chain = self.chains.setdefault(pass_code, [0, Counter(), 0])
+        for other_code, other_chain in self.chains.items():
+            if other_code != pass_code:
+                other_chain[0] = 0
+
+        chain_length, chain_lengths, _ = chain
+        if chain_length:
+            chain_lengths[chain_length] -= 1
+            if not chain_lengths[chain_length]:
+                del chain_lengths[chain_length]
+        chain[0] = chain_length = chain_length + 1
+        chain_lengths[chain_length] += 1
+        chain[2] = max(chain[2], chain_length)
 
     def get_passes(self):
         """Returns all passes (Pass instance) in time-ordered list
         """
-        passes = []
-        for event in self.events:
-            if isinstance(event, Pass):
-                passes.append(event)
-        return passes
+        return list(self.passes)
+
+    def pass_target_counts(self, team:'Team') -> Counter:
+        """Returns number of passes by the team per target
+
+        Args:
+            team: team of the passing players
+
+        Returns:
+            Counter {target: count}, target as in Pass (0 opponent, 1 own team, 2 out)
+        """
+        return Counter(self.target_counts.get(team, {}))
     
 class Team:
     """Team class representing a home team or away team in a game.
@@ -179,11 +236,7 @@ class Team:
         Returns:
             list of passes by the team in the game
         """
-        passes = []
-        for _pass_ in self.game.get_passes():
-            if _pass_.passing_player.team == self:
-                passes.append(_pass_)
-        return passes
+        return list(self.game.index.select(Query(type=Pass, team=self)))
 
 class Player:
     """Player class"""
@@ -215,11 +268,7 @@ class Player:
         Returns:
             time-ordered list of passes by the player in the game
         """
-        passes = []
-        for _pass_ in self.team.get_passes():
-            if _pass_.passing_player == self:
-                passes.append(_pass_)
-        return passes
+        return list(self.team.game.index.select(Query(type=Pass, passer=self)))
 
 class GameEvent:
     """Game event class as a base class for all game events"""
@@ -8,10 +8,13 @@ Attributes:
     p (classes.GameEvent): global game event
 
 Functions:
-    - 'create_pass_event(team, event)': initialize a pass event from ui binded event
-    - 'finalize_pass_event(game_event, team, event)': finalize a pass event from ui binded event
+    - 'create_pass_event(passing_player)': initialize a pass event
+    - 'finalize_pass_event(game_event, receiving_player)': finalize a pass event
+    - 'player_grid_left_click(event)': initialize a pass event from a click on the player grid
+    - 'player_grid_right_click(event)': finalize a pass event from a click on the player grid
     - 'muotoile_peliaika(sekunnit)': modifies wall clock time based on seconds given to show minutes and seconds properly
-    - 'update_time': updates game timer
+    - 'update_time': updates game timer, rolling-window stats and time series
+    - 'sample_statistics': records statistics to the time series and the chart
 """
 
 from time import time
@@ -20,7 +23,25 @@ from tkinter import Event, Tk
 
 import ui
 
-from classes import Game, GameEvent, Team, Pass
+from classes import Game, GameEvent, Player, Pass
+from storage import StatisticsStore
+from rolling import RollingStats, LAST_PASSES, WINDOW_SECONDS
+from timeseries import RingBuffer, LiveChart
+from analytics import pass_pct_intervals
+from markov import PassOutcomeModel
+from playergrid import PlayerGrid
+
+# SQLite database into which finished games are saved for cross-game statistics
+STATISTICS_DATABASE = 'statistics.db'
+
+# Per-second samples of the statistics, exported to csv when the game ends
+TIMESERIES_CSV = 'timeseries.csv'
+TIMESERIES_COLORS = {
+    'bc_pc_home_team': 'blue',
+    'bc_pc_away_team': 'red',
+    'pass_pct_home_team': 'dark blue',
+    'pass_pct_away_team': 'dark red',
+}
 
 # Initialize new game instance and add details
 g = Game('game.json')
@@ -29,6 +50,12 @@ ui.ball_control_check.set('home') # Setting home team as the default starting te
 g.ball_control_team = g.home_team
 g.ball_control_start_time = 0
 
+# Rolling-window stats of the last passes and the last minutes, window sizes as in the ui headers
+g.rolling_stats = RollingStats(g, last_passes=LAST_PASSES, window_seconds=WINDOW_SECONDS)
+
+# Pass outcome models of both teams for pass chain probabilities
+g.chain_models = {team: PassOutcomeModel(team.name) for team in [g.home_team, g.away_team]}
+
 # Game total time from json file, but time can be modified before period is started
 ui.e_game_total_time.insert(0, str(g.total_game_time))
 ui.e_game_total_time.delete(2, 'end')
@@ -36,12 +63,11 @@ ui.e_game_total_time.delete(2, 'end')
 ui.l_home_team['text'] = g.home_team.name
 ui.l_away_team['text'] = g.away_team.name
 
-def create_pass_event(team:Team, event:Event):
-    """Initializes a game event based on ui event
+def create_pass_event(passing_player:Player):
+    """Initializes a game event
 
     Args:
-        team: team which passes the ball
-        event: player number click event in ui
+        passing_player: player who passes the ball
 
     Output:
         initialize new global p (classes.GameEvent) variable
@@ -54,36 +80,28 @@ def create_pass_event(team:Team, event:Event):
         p = None
         return None
 
-    passing_player = team.get_player(event.widget.cget('text'))
-    
     p = GameEvent(ui.game_timer.get(), passing_player)
 
-def finalize_pass_event(game_event:GameEvent, team:Team, event:Event):
+def finalize_pass_event(game_event:GameEvent, receiving_player):
     """Finalize pass event based in initialized game event
     
     Args:
         game_event: Previously created game_event
-        team: pass receiving team
-        event: player number click event in ui
+        receiving_player: player (Player) who receives the pass or 'out'
     
     Return:
-        if game_event.initialized_player.team == team -> None, Pass event not created
+        if game_event.initialization_player == receiving_player -> None, Pass event not created
         and returns None
         if game.started = False, returns None
     
     Output:
-        Appends pass event to g.events list and updates pass statistics
+        Adds pass event to the game with g.add_event and updates pass statistics
     """
 
     global p
     
     if not p:
         return None
-    
-    if team is not None:
-        receiving_player = team.get_player(event.widget.cget('text'))
-    else:
-        receiving_player = 'out'
 
     # Return nothing if self pass
     if game_event.initialization_player == receiving_player:
@@ -100,11 +118,15 @@ def finalize_pass_event(game_event:GameEvent, team:Team, event:Event):
 
     pass_transfer = Pass(game_event=game_event, receiving_player=receiving_player)
 
-    g.events.append(pass_transfer)
+    g.add_event(pass_transfer)
+    g.rolling_stats.add_pass(pass_transfer, g.game_timer)
+    for chain_model in g.chain_models.values():
+        chain_model.add(pass_transfer)
 
     p = None # Set global GameEvent variable to None
   
     ui.update_pass_transfer_stats(g)
+    ui.update_rolling_stats(g)
     
 def format_timer(seconds:int) -> str:
     """Formats game timer and ball control timer from seconds to minute and seconds
@@ -146,6 +168,11 @@ def update_time():
 
     update_ball_control_timers()
 
+    # Rolling windows and time series are advanced once per game second
+    if g.rolling_stats.tick(g.game_timer, g.ball_control_team):
+        ui.update_rolling_stats(g)
+        sample_statistics()
+
     ui.f_teams_clock_score.after(200, update_time)
 
 def update_ball_control_timers(*args):
@@ -186,6 +213,26 @@ def update_ball_control_timers(*args):
     ui.bc_timer_home_team.set(format_timer(g.home_team.ball_control_timer))
     ui.bc_timer_away_team.set(format_timer(g.away_team.ball_control_timer))
 
+def sample_statistics():
+    """Records current ball control and pass percentages to the time series and the chart
+    """
+
+    ball_control_total = g.home_team.ball_control_timer + g.away_team.ball_control_timer
+    samples = {}
+    for team, suffix in [(g.home_team, 'home_team'), (g.away_team, 'away_team')]:
+        try:
+            samples['bc_pc_' + suffix] = team.ball_control_timer / ball_control_total
+        except ZeroDivisionError:
+            samples['bc_pc_' + suffix] = 0
+        target_counts = g.pass_target_counts(team)
+        try:
+            samples['pass_pct_' + suffix] = target_counts[1] / sum(target_counts.values())
+        except ZeroDivisionError:
+            samples['pass_pct_' + suffix] = 0
+
+    g.timeseries.append(g.game_timer, samples)
+    g.chart.add(g.game_timer, samples)
+
 # Add game control button actions
 def start_game():
     """Method when Start-button is clicked."""
@@ -197,6 +244,10 @@ def start_game():
 
     ui.e_game_total_time.state(['readonly'])
 
+    # Room for twice the game time so that stoppage time is not overwritten
+    g.timeseries = RingBuffer(2 * g.total_game_time * 60, TIMESERIES_COLORS)
+    g.chart = LiveChart(ui.c_stats_chart, g.timeseries.capacity, TIMESERIES_COLORS)
+
     update_time()
 
 ui.b_game_start.configure(command=start_game)
@@ -204,48 +255,36 @@ ui.b_game_start.configure(command=start_game)
 # When ball_control is changed
 ui.ball_control_check.trace_add(mode='write', callback=update_ball_control_timers)
 
-col, row = 0, 1
-# Binding home player buttons
-for player in g.home_team.players:
-    b_player = ui.ttk.Button(
-        ui.f_pass_players,
-        text=player.player_number)
-    b_player.grid(column=col, row=row)
-
-    b_player.bind('<ButtonPress-1>', lambda e: create_pass_event(team=g.home_team, event=e))
-    b_player.bind('<ButtonPress-3>', lambda e: finalize_pass_event(game_event=p, team=g.home_team, event=e))
-    col += 1
-
-col = 0
-row += 2
+# Players of both teams and out of field targets on one canvas
+player_grid = PlayerGrid(ui.c_player_grid, [g.home_team, g.away_team], ["Sivurajalta\nulos", "Päätyrajalta\nulos"])
 
-# Binding away player buttons
-for player in g.away_team.players:
-    b_player = ui.ttk.Button(
-        ui.f_pass_players,
-        text=player.player_number)
-    b_player.grid(column=col, row=row)
+def player_grid_left_click(event:Event):
+    """Initializes a pass event when a player is left clicked on the player grid"""
+    target = player_grid.target_at(event.x, event.y)
+    if isinstance(target, Player):
+        create_pass_event(passing_player=target)
 
-    b_player.bind('<ButtonPress-1>', lambda e: create_pass_event(team=g.away_team, event=e))
-    b_player.bind('<ButtonPress-3>', lambda e: finalize_pass_event(game_event=p, team=g.away_team, event=e))
-    col += 1
+def player_grid_right_click(event:Event):
+    """Finalizes a pass event when a player or out of field is right clicked on the player grid"""
+    target = player_grid.target_at(event.x, event.y)
+    if target is not None:
+        finalize_pass_event(game_event=p, receiving_player=target)
 
-b_out_of_sides = ui.ttk.Button(ui.f_pass_players, text="Sivurajalta\nulos")
-b_out_of_sides.bind('<ButtonPress-3>', lambda e: finalize_pass_event(game_event=p, team=None, event=e))
+ui.c_player_grid.bind('<ButtonPress-1>', player_grid_left_click)
+ui.c_player_grid.bind('<ButtonPress-3>', player_grid_right_click)
 
-b_out_of_ends = ui.ttk.Button(ui.f_pass_players, text="Päätyrajalta\nulos")
-b_out_of_ends.bind('<ButtonPress-3>', lambda e: finalize_pass_event(game_event=p, team=None, event=e))
-
-b_out_of_sides.grid(column=0, row=row+1)
-b_out_of_ends.grid(column=1, row=row+1)
+ui.root.mainloop()
 
-ui.l_players_text_home['text'] =  g.home_team.name
-ui.l_players_text_away['text'] =  g.away_team.name
+# Save the finished game for statistics over several games
+if g.started:
+    store = StatisticsStore(STATISTICS_DATABASE)
+    try:
+        store.save_game(g)
+    except ValueError as error:
+        print(error)
+    store.close()
 
-ui.l_players_text_home.grid(columnspan=len(g.home_team.players), sticky="W")
-ui.l_players_text_away.grid(columnspan=len(g.away_team.players), sticky="W")
-
-ui.root.mainloop()
+    g.timeseries.export_csv(TIMESERIES_CSV)
 
 pass_codes = [p.code() for p in g.get_passes()]
 
@@ -274,11 +313,17 @@ print(f"Valkoiset: Syötöt yhteensä: {total_passes_away}, joista omille {pass_
 for k, v in sorted(pass_counter_series_home.items(), key=lambda x: x[1], reverse=True):
     print(f"Pituus: {k}, määrä: {v}")
 
+# Print pass chain estimates of the pass outcome models
+for team, chain_model in g.chain_models.items():
+    print(f"{team.name}: syöttöketjun odotettu pituus {chain_model.expected_chain_length():.2f}, "
+          f"vähintään 5 syötön ketju {chain_model.chain_probability(5, current_chain=1):.1%}")
+
 # Print last pass game time
 if len(g.events) > 0:
     print(f"Syöttöaika: {g.events[-1].gametime}")
 
-# Print list of passing players
+# Print list of passing players with 95 % confidence intervals of pass %
+intervals = pass_pct_intervals([g], method='wilson')
 for team in [g.home_team, g.away_team]:
     print(f"Joukkue - {team.name}")
     for player in team.players:
@@ -288,5 +333,6 @@ for team in [g.home_team, g.away_team]:
             s_pct = len(successful_passes) / len(passes)
         except ZeroDivisionError:
             s_pct = 0
-        print(f"{player.player_number} - {player.name}: {len(passes)} syöttöä - {s_pct:.1%}")
+        _, _, low, high = intervals['players'][(team.name, player.player_number)]
+        print(f"{player.player_number} - {player.name}: {len(passes)} syöttöä - {s_pct:.1%} ({low:.1%}-{high:.1%})")
 ### --- THIS SECTION ONLY FOR TESTING ---
\ No newline at end of file
@@ -0,0 +1,218 @@
+# tilastoseuranta/markov.py
+
+"""Markov model of pass outcomes for pass chain probabilities
+
+Every pass has an integer coded outcome seen from one team, the focus
+team: 'side * 3 + target', where side is 0 for a pass by the focus team and
+1 for a pass by the opponent, and target is as in 'Pass' (0 opponent, 1 own
+team, 2 out). The model counts transitions between the outcomes of
+consecutive passes, so it is built from one game or a whole season and is
+updated in O(1) as passes arrive.
+
+A pass chain of the focus team is a run of outcome 1. Under the model its
+length is geometric, so chain length distribution and expected length have
+closed forms. The probability of completing a chain within the next passes
+is an absorbing Markov chain, answered with a matrix power.
+
+The module contains the following classes
+
+- 'PassOutcomeModel' - transition counts and chain queries of a focus team
+"""
+
+import numpy as np
+
+from analytics import encode_passes
+
+OUTCOMES = 6 # side (focus team, opponent) x target (opponent, own team, out)
+CHAIN_OUTCOME = 1 # pass by the focus team to own team
+
+class PassOutcomeModel:
+    """Pass outcome transitions seen from a focus team"""
+
+    def __init__(self, team_name:str):
+        """
+        Args:
+            team_name: name of the focus team
+
+        Attributes:
+            team_name (str): name of the focus team
+            counts (ndarray): OUTCOMES x OUTCOMES transition counts, previous outcome on rows
+            state (int): outcome of the latest pass, None before the first pass of a game
+            chain (int): length of the ongoing chain of the focus team
+        """
+        self.team_name = team_name
+        self.counts = np.zeros((OUTCOMES, OUTCOMES), dtype=np.int64)
+        self.state = None
+        self.chain = 0
+
+    def outcome(self, pass_transfer) -> int:
+        """Returns integer coded outcome of a pass
+
+        Args:
+            pass_transfer: Pass event
+        """
+        side = 0 if pass_transfer.passing_player.team.name == self.team_name else 1
+        return side * 3 + pass_transfer.target
+
+    def new_game(self):
+        """Starts a new game, the next pass does not continue the previous one"""
+        self.state = None
+        self.chain = 0
+
+    def add(self, pass_transfer):
+        """Adds the latest pass of the game to the model
+
+        Args:
+            pass_transfer: Pass event
+        """
+        state = self.outcome(pass_transfer)
+        if self.state is not None:
+            self.counts[self.state, state] += 1
+        self.state = state
+        self.chain = self.chain + 1 if state == CHAIN_OUTCOME else 0
+
+    def fit(self, games:list):
+        """Adds all passes of the games to the model at once
+
+        Args:
+            games: list of games (Game)
+        """
+        encoded = encode_passes(games)
+        if len(encoded['target']) == 0:
+            return
+        focus = encoded['teams'].index(self.team_name) if self.team_name in encoded['teams'] else -1
+        states = np.where(encoded['team'] == focus, 0, 3) + encoded['target']
+
+        same_game = encoded['game'][:-1] == encoded['game'][1:]
+        np.add.at(self.counts, (states[:-1][same_game], states[1:][same_game]), 1)
+
+        # The model continues from the end of the last game
+        last_game = encoded['game'] == encoded['game'][-1]
+        self.state = int(states[-1])
+        run = np.flatnonzero((states != CHAIN_OUTCOME) | ~last_game)
+        self.chain = len(states) - 1 - run[-1] if len(run) else len(states)
+
+    def transition_matrix(self) -> np.ndarray:
+        """Returns row stochastic transition probabilities, uniform for outcomes without data"""
+        totals = self.counts.sum(axis=1, keepdims=True)
+        return np.where(totals > 0, self.counts / np.maximum(totals, 1), 1 / OUTCOMES)
+
+    def continuation_probability(self) -> float:
+        """Returns probability that a pass to own team is followed by another one"""
+        return float(self.transition_matrix()[CHAIN_OUTCOME, CHAIN_OUTCOME])
+
+    def chain_length_distribution(self, max_length:int) -> np.ndarray:
+        """Returns probabilities of chain lengths 1..max_length for a started chain
+
+        Examples:
+            >>> model = PassOutcomeModel('Oranssit')
+            >>> model.counts[1, 1], model.counts[1, 0] = 1, 1
+            >>> model.chain_length_distribution(3)
+            array([0.5  , 0.25 , 0.125])
+
+        Args:
+            max_length: longest chain length
+
+        Returns:
+            array, index k - 1 is the probability of length k
+        """
+        p = self.continuation_probability()
+        return (1 - p) * p ** np.arange(max_length)
+
+    def expected_chain_length(self) -> float:
+        """Returns expected length of a started chain, infinity if chains never end"""
+        p = self.continuation_probability()
+        return 1 / (1 - p) if p < 1 else float('inf')
+
+    def _outcome_frequencies(self) -> np.ndarray:
+        """Returns observed frequency of each outcome, uniform without data"""
+        frequencies = self.counts.sum(axis=0) + self.counts.sum(axis=1)
+        return frequencies / frequencies.sum() if frequencies.sum() else np.full(OUTCOMES, 1 / OUTCOMES)
+
+    def chain_probability(self, length:int, current_chain:int=None, state:int=None) -> float:
+        """Returns probability that a chain reaches at least given length
+
+        Without an ongoing chain the next pass has to start the chain, which
+        happens with the transition probability from the latest outcome.
+
+        Examples:
+            >>> model = PassOutcomeModel('Oranssit')
+            >>> model.counts[1, 1], model.counts[1, 0] = 1, 1
+            >>> model.counts[0, 1], model.counts[0, 0] = 1, 3
+            >>> model.chain_probability(3, current_chain=1), model.chain_probability(3, current_chain=2)
+            (0.25, 0.5)
+            >>> model.chain_probability(3, current_chain=0, state=0)
+            0.0625
+
+        Args:
+            length: chain length
+            current_chain: passes already in the ongoing chain, 1 for a chain which has
+                just started and 0 for no chain yet (default: ongoing chain of the model)
+            state: outcome of the latest pass, used when there is no chain (default:
+                latest pass of the model, or observed outcome frequencies if there is none)
+        """
+        current_chain = self.chain if current_chain is None else current_chain
+        if current_chain >= length:
+            return 1.0
+        continuation = self.continuation_probability()
+        if current_chain > 0:
+            return continuation ** (length - current_chain)
+
+        state = self.state if state is None else state
+        if state is not None:
+            start = self.transition_matrix()[state, CHAIN_OUTCOME]
+        else:
+            start = self._outcome_frequencies()[CHAIN_OUTCOME]
+        return float(start * continuation ** (length - 1))
+
+    def chain_within(self, length:int, passes:int, state:int=None, current_chain:int=None) -> float:
+        """Returns probability that a chain of at least given length is completed
+        within the next passes
+
+        The outcomes are extended with chain counters 1..length-1 and an
+        absorbing state for a completed chain. The probability is the absorbing
+        state of the start distribution times the transition matrix raised to
+        the number of passes.
+
+        Args:
+            length: chain length
+            passes: number of next passes
+            state: outcome of the latest pass (default: latest pass of the model,
+                or observed outcome frequencies if there is none)
+            current_chain: passes already in the ongoing chain (default: as in the model)
+        """
+        state = self.state if state is None else state
+        current_chain = self.chain if current_chain is None else current_chain
+        if state == CHAIN_OUTCOME:
+            current_chain = max(current_chain, 1)
+        if current_chain >= length:
+            return 1.0
+
+        transitions = self.transition_matrix()
+        others = [outcome for outcome in range(OUTCOMES) if outcome != CHAIN_OUTCOME]
+        # Extended states: other outcomes, chain counters 1..length-1, completed chain
+        size = len(others) + length
+        other_index = {outcome: i for i, outcome in enumerate(others)}
+        chain_index = lambda counter: len(others) + counter - 1 # completed chain at counter == length
+
+        extended = np.zeros((size, size))
+        sources = [(other_index[outcome], outcome, 0) for outcome in others]
+        sources += [(chain_index(counter), CHAIN_OUTCOME, counter) for counter in range(1, length)]
+        for row, outcome, counter in sources:
+            for target in others:
+                extended[row, other_index[target]] = transitions[outcome, target]
+            extended[row, chain_index(counter + 1)] = transitions[outcome, CHAIN_OUTCOME]
+        extended[-1, -1] = 1
+
+        start = np.zeros(size)
+        if current_chain > 0:
+            start[chain_index(current_chain)] = 1
+        elif state is not None:
+            start[other_index[state]] = 1
+        else:
+            frequencies = self._outcome_frequencies()
+            for outcome in others:
+                start[other_index[outcome]] = frequencies[outcome]
+            start[chain_index(1)] = frequencies[CHAIN_OUTCOME]
+
+        return float((start @ np.linalg.matrix_power(extended, passes))[-1])
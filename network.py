@@ -0,0 +1,214 @@
+# tilastoseuranta/network.py
+
+"""Pass network analytics with sparse matrices
+
+Successful passes form a directed network between players of a team. The
+network of a game or a season is a sparse passer -> receiver matrix whose
+elements are pass counts, built from the integer coded passes of
+'analytics.encode_passes'. Centralities, triangles and chain paths are
+computed with sparse matrix products and NumPy array operations instead of
+traversing the network player by player, so a league with hundreds of
+players and millions of passes is handled in one go.
+
+Functions:
+    - 'adjacency_matrix(passers, receivers, players)': sparse passer -> receiver pass count matrix
+    - 'game_adjacency_matrices(encoded)': adjacency matrix of each game
+    - 'season_adjacency_matrix(encoded)': adjacency matrix over all games
+    - 'degree_centrality(adjacency)': passes made and received by each player
+    - 'pagerank(adjacency, damping, tolerance, max_iterations)': PageRank of each player
+    - 'pass_triangles(adjacency, top)': most common three player pass cycles
+    - 'chain_paths(encoded, length, top)': most common paths of consecutive passes
+"""
+
+import numpy as np
+from scipy import sparse
+
+def adjacency_matrix(passers, receivers, players:int) -> sparse.csr_matrix:
+    """Returns sparse matrix of pass counts from passer (row) to receiver (column)
+
+    Examples:
+        >>> adjacency_matrix([0, 0, 1], [1, 1, 0], 2).toarray()
+        array([[0, 2],
+               [1, 0]])
+
+    Args:
+        passers: player code of each passing player
+        receivers: player code of each receiving player
+        players: number of players
+
+    Returns:
+        players x players csr_matrix
+    """
+    passers = np.asarray(passers)
+    receivers = np.asarray(receivers)
+    counts = np.ones(len(passers), dtype=np.int64)
+    # Duplicate (passer, receiver) pairs are summed when converting to csr
+    return sparse.coo_matrix((counts, (passers, receivers)), shape=(players, players)).tocsr()
+
+def _successful(encoded:dict):
+    """Returns mask of passes to own team"""
+    return encoded['target'] == 1
+
+def game_adjacency_matrices(encoded:dict) -> list:
+    """Returns adjacency matrix of successful passes of each game
+
+    Args:
+        encoded: passes coded with 'analytics.encode_passes'
+
+    Returns:
+        list of csr_matrix, index is the game index
+    """
+    players = len(encoded['players'])
+    successful = _successful(encoded)
+    games = encoded['game'][successful]
+    passers = encoded['player'][successful]
+    receivers = encoded['receiver'][successful]
+
+    # Stacking the games on top of each other gives all games in one matrix
+    game_count = encoded['games']
+    counts = np.ones(len(passers), dtype=np.int64)
+    stacked = sparse.coo_matrix(
+        (counts, (games * players + passers, receivers)), shape=(game_count * players, players)).tocsr()
+    return [stacked[game * players:(game + 1) * players] for game in range(game_count)]
+
+def season_adjacency_matrix(encoded:dict) -> sparse.csr_matrix:
+    """Returns adjacency matrix of successful passes of all games
+
+    Args:
+        encoded: passes coded with 'analytics.encode_passes'
+    """
+    successful = _successful(encoded)
+    return adjacency_matrix(encoded['player'][successful], encoded['receiver'][successful], len(encoded['players']))
+
+def degree_centrality(adjacency:sparse.spmatrix) -> tuple:
+    """Returns weighted degree centralities
+
+    Args:
+        adjacency: passer -> receiver pass count matrix
+
+    Returns:
+        arrays (passes made, passes received) per player
+    """
+    return np.asarray(adjacency.sum(axis=1)).ravel(), np.asarray(adjacency.sum(axis=0)).ravel()
+
+def pagerank(adjacency:sparse.spmatrix, damping:float=0.85, tolerance:float=1e-10, max_iterations:int=100) -> np.ndarray:
+    """Returns PageRank of each player in a pass network
+
+    A player gets a high rank when often passed to by players who themselves
+    have a high rank. Players who have not passed spread their rank evenly.
+
+    Args:
+        adjacency: passer -> receiver pass count matrix
+        damping: probability of following a pass (default: 0.85)
+        tolerance: L1 change at which the power iteration stops (default: 1e-10)
+        max_iterations: maximum number of power iterations (default: 100)
+
+    Returns:
+        array of ranks summing to 1
+    """
+    players = adjacency.shape[0]
+    if players == 0:
+        return np.zeros(0)
+
+    out_degree = np.asarray(adjacency.sum(axis=1)).ravel().astype(float)
+    dangling = out_degree == 0
+    inverse_degree = np.divide(1, out_degree, out=np.zeros(players), where=~dangling)
+    # Column stochastic transition matrix: rank flows from passer to receiver
+    transition = (sparse.diags(inverse_degree) @ adjacency).T.tocsr()
+
+    rank = np.full(players, 1 / players)
+    for _ in range(max_iterations):
+        previous = rank
+        rank = damping * (transition @ rank + rank[dangling].sum() / players) + (1 - damping) / players
+        if np.abs(rank - previous).sum() < tolerance:
+            break
+    return rank
+
+def pass_triangles(adjacency:sparse.spmatrix, top:int=10) -> list:
+    """Returns most common pass triangles, i.e. cycles a -> b -> c -> a
+
+    A triangle is weighted by the pass count of its weakest link. Every
+    two-pass path a -> b -> c is formed by joining the csr rows of the matrix,
+    and the closing pass c -> a is looked up for all paths at once.
+
+    Examples:
+        >>> pass_triangles(adjacency_matrix([0, 1, 2, 2], [1, 2, 0, 0], 3))
+        [((0, 1, 2), 1)]
+        >>> pass_triangles(adjacency_matrix([0, 1], [1, 0], 3))
+        []
+
+    Args:
+        adjacency: passer -> receiver pass count matrix
+        top: number of triangles returned (default: 10)
+
+    Returns:
+        list of ((a, b, c), weight), most common first, a is the smallest player code
+    """
+    adjacency = sparse.csr_matrix(adjacency)
+    adjacency.eliminate_zeros()
+    coo = adjacency.tocoo()
+    first, second, first_weight = coo.row, coo.col, coo.data
+
+    # Expand each edge a -> b with all edges b -> c
+    indptr = adjacency.indptr
+    out_degree = np.diff(indptr)
+    repeats = out_degree[second]
+    path_first = np.repeat(np.arange(len(first)), repeats)
+    offsets = np.arange(len(path_first)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    path_second = np.repeat(indptr[second], repeats) + offsets
+
+    a = first[path_first]
+    b = second[path_first]
+    c = adjacency.indices[path_second]
+
+    # Each cycle is found three times, keep the rotation starting from the smallest code
+    keep = (a < b) & (a < c)
+    a, b, c = a[keep], b[keep], c[keep]
+    # Indexing with empty arrays gives a sparse matrix instead of an array
+    if len(a) == 0:
+        return []
+    weight = np.minimum(first_weight[path_first[keep]], adjacency.data[path_second[keep]])
+    closing = np.asarray(adjacency[c, a]).ravel()
+    weight = np.minimum(weight, closing)
+
+    closed = closing > 0
+    a, b, c, weight = a[closed], b[closed], c[closed], weight[closed]
+    order = np.argsort(-weight, kind='stable')[:top]
+    return [((int(a[i]), int(b[i]), int(c[i])), int(weight[i])) for i in order]
+
+def chain_paths(encoded:dict, length:int=2, top:int=10) -> list:
+    """Returns most common paths of consecutive passes within a team
+
+    A path of 'length' passes is a run of passes to own team where each pass
+    is made by the receiver of the previous one in the same game.
+
+    Args:
+        encoded: passes coded with 'analytics.encode_passes'
+        length: number of passes in a path (default: 2)
+        top: number of paths returned (default: 10)
+
+    Returns:
+        list of ((player codes along the path), count), most common first
+    """
+    passers = encoded['player']
+    receivers = np.where(_successful(encoded), encoded['receiver'], -1)
+    games = encoded['game']
+    if len(passers) < length or length < 1:
+        return []
+
+    # linked[i] tells if pass i + 1 continues pass i
+    linked = (receivers[:-1] == passers[1:]) & (games[:-1] == games[1:])
+    # A path starting at i needs length - 1 consecutive links and a successful last pass
+    links = np.concatenate(([0], np.cumsum(linked)))
+    starts = np.arange(len(passers) - length + 1)
+    valid = links[starts + length - 1] - links[starts] == length - 1
+    valid &= receivers[starts + length - 1] >= 0
+    starts = starts[valid]
+    if len(starts) == 0:
+        return []
+
+    steps = starts[:, None] + np.arange(length)
+    paths = np.column_stack((passers[steps], receivers[starts + length - 1]))
+    unique_paths, counts = np.unique(paths, axis=0, return_counts=True)
+    order = np.argsort(-counts, kind='stable')[:top]
+    return [(tuple(int(player) for player in unique_paths[i]), int(counts[i])) for i in order]
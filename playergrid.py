@@ -0,0 +1,102 @@
+# tilastoseuranta/playergrid.py
+
+"""Player grid drawn on a single Canvas
+
+Instead of a button widget per player, all players of both teams and the
+out of field targets are drawn as cells of one Canvas. The canvas has one
+binding per mouse button, and the clicked cell is found from the click
+position with integer division and a list lookup, which gives the Player
+object (or 'out') directly.
+
+The module contains the following classes
+
+- 'PlayerGrid' - canvas grid of pass targets with O(1) hit-testing
+"""
+
+class PlayerGrid:
+    """Grid of pass targets drawn on a Canvas"""
+
+    cell_width = 36
+    cell_height = 40
+    out_columns = 3 # columns spanned by an out of field cell
+
+    def __init__(self, canvas, teams:list, out_labels:list):
+        """Draws the grid and sizes the canvas to fit it
+
+        Each team takes two rows, the team name and its players. The out of
+        field cells are on the last row.
+
+        Args:
+            canvas: tkinter Canvas to draw on
+            teams: teams (Team) from top to bottom
+            out_labels: texts of the out of field cells
+
+        Attributes:
+            canvas (Canvas): canvas the grid is drawn on
+            cells (list): rows of columns, each cell is a Player, 'out' or None
+            positions (dict): center (x, y) of the first cell of each Player and out label
+        """
+        self.canvas = canvas
+        self.cells = []
+        self.positions = {}
+
+        columns = max([len(team.players) for team in teams] + [len(out_labels) * self.out_columns])
+        for team in teams:
+            self._draw_text_row(team.name, columns)
+            self._draw_row([(player, str(player.player_number), 1) for player in team.players], columns)
+        self._draw_row([('out', label, self.out_columns) for label in out_labels], columns)
+
+        canvas.configure(width=columns * self.cell_width, height=len(self.cells) * self.cell_height)
+
+    def _draw_text_row(self, text:str, columns:int):
+        row = len(self.cells)
+        self.canvas.create_text(2, row * self.cell_height + self.cell_height / 2, text=text, anchor='w')
+        self.cells.append([None] * columns)
+
+    def _draw_row(self, targets:list, columns:int):
+        """Draws a row of (target, text, columns spanned) cells"""
+        row = len(self.cells)
+        cells = []
+        top = row * self.cell_height
+        for target, text, span in targets:
+            left = len(cells) * self.cell_width
+            right = left + span * self.cell_width
+            self.canvas.create_rectangle(left + 1, top + 1, right - 1, top + self.cell_height - 1, fill='white', outline='gray')
+            self.canvas.create_text((left + right) / 2, top + self.cell_height / 2, text=text, justify='center')
+            cells.extend([target] * span)
+            self.positions.setdefault(text if target == 'out' else target, ((left + right) // 2, top + self.cell_height // 2))
+        self.cells.append(cells + [None] * (columns - len(cells)))
+
+    def target_at(self, x:int, y:int):
+        """Returns pass target at canvas position
+
+        Examples:
+            Two out of field cells span columns 0-2 and 3-5 of the last row
+
+            >>> from classes import Team
+            >>> class FakeCanvas:
+            ...     def configure(self, **options): pass
+            ...     def create_rectangle(self, *coordinates, **options): pass
+            ...     def create_text(self, *coordinates, **options): pass
+            >>> team = Team('Oranssit')
+            >>> team.add_players(['7 - Pelaaja', '9 - Pelaaja'])
+            >>> grid = PlayerGrid(FakeCanvas(), [team], ['Sivu', 'Pääty'])
+            >>> grid.target_at(40, 50).player_number
+            9
+            >>> grid.target_at(150, 100)
+            'out'
+            >>> grid.target_at(10, 10) is None, grid.target_at(300, 50) is None, grid.target_at(-1, 50) is None
+            (True, True, True)
+
+        Args:
+            x: x coordinate of the click
+            y: y coordinate of the click
+
+        Returns:
+            Player, 'out' or None if there is no target at the position
+        """
+        row = y // self.cell_height
+        column = x // self.cell_width
+        if 0 <= row < len(self.cells) and 0 <= column < len(self.cells[row]):
+            return self.cells[row][column]
+        return None
@@ -0,0 +1,214 @@
+# tilastoseuranta/query.py
+
+"""Event queries on bitmap indexes
+
+Each indexed attribute of an event (type, team, passer, receiver, target) has
+a bitmap per value, where bit i tells if the i:th event of the game has that
+value. Bitmaps are bytearrays, so indexing a new event only sets one bit per
+attribute. A query combines the bitmaps with AND, OR and NOT as Python
+integers and counts or groups the result without building lists of events.
+Events are added in time order, so a time range is a contiguous range of
+event ids found with bisect.
+
+Examples:
+    >>> own_passes = Query(type=Pass, team=g.home_team, target=1)  # doctest: +SKIP
+    >>> g.index.count(own_passes | Query(type=Pass, receiver='out'))  # doctest: +SKIP
+    >>> g.index.group_count(Query(type=Pass, time=(0, 300)), 'passer')  # doctest: +SKIP
+
+The module contains the following classes
+
+- 'EventIndex' - bitmap indexes over events of a game
+- 'Query' - AND/OR/NOT combinable predicate on indexed attributes
+"""
+
+from bisect import bisect_left
+
+def gametime_seconds(gametime) -> int:
+    """Returns game time string 'mm:ss' in seconds, 0 if not set
+
+    Examples:
+        >>> gametime_seconds('12:05')
+        725
+        >>> gametime_seconds('')
+        0
+
+    Args:
+        gametime: game time as 'mm:ss' string or seconds
+    """
+    if isinstance(gametime, int):
+        return gametime
+    try:
+        minutes, seconds = str(gametime).split(':')
+        return int(minutes) * 60 + int(seconds)
+    except ValueError:
+        return 0
+
+def _event_attributes(event) -> dict:
+    """Returns values of the indexed attributes of an event"""
+    passer = getattr(event, 'passing_player', getattr(event, 'initialization_player', None))
+    return {
+        'type': type(event),
+        'team': getattr(passer, 'team', None),
+        'passer': passer,
+        'receiver': getattr(event, 'receiving_player', None),
+        'target': getattr(event, 'target', None),
+    }
+
+class EventIndex:
+    """Bitmap indexes over the events of a game"""
+
+    attributes = ['type', 'team', 'passer', 'receiver', 'target']
+
+    def __init__(self, events:list=None):
+        """Initializes indexes and indexes the given events
+
+        Args:
+            events: time-ordered events to index (default: None)
+
+        Attributes:
+            events (tuple): indexed events, index is the event id, read-only (use add)
+            bitmaps (dict): attribute -> {value: bytearray bitmap of event ids}
+            seconds (list): game time in seconds of each event
+        """
+        self._events = []
+        self.bitmaps = {attribute: {} for attribute in self.attributes}
+        self.seconds = []
+        for event in events or []:
+            self.add(event)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def events(self) -> tuple:
+        return tuple(self._events)
+
+    def add(self, event):
+        """Indexes an event as the latest event of the game
+
+        Args:
+            event: game event (GameEvent)
+        """
+        event_id = len(self._events)
+        self._events.append(event)
+        self.seconds.append(gametime_seconds(event.gametime))
+
+        byte, bit = divmod(event_id, 8)
+        for attribute, value in _event_attributes(event).items():
+            bitmap = self.bitmaps[attribute].setdefault(value, bytearray())
+            if len(bitmap) <= byte:
+                bitmap.extend(bytes(byte + 1 - len(bitmap)))
+            bitmap[byte] |= 1 << bit
+
+    def bitmap(self, attribute:str, value) -> int:
+        """Returns bitmap of events whose attribute equals value as int"""
+        return int.from_bytes(self.bitmaps[attribute].get(value, b''), 'little')
+
+    def all(self) -> int:
+        """Returns bitmap of all events as int"""
+        return (1 << len(self._events)) - 1
+
+    def time_range(self, start:int, end:int) -> int:
+        """Returns bitmap of events with start <= game seconds < end as int
+
+        Game time never decreases, so the events form a contiguous id range.
+        An empty or reversed range matches no events.
+
+        Examples:
+            >>> from types import SimpleNamespace
+            >>> index = EventIndex([SimpleNamespace(gametime=f"0{minute}:00") for minute in range(3)])
+            >>> bin(index.time_range(60, 180)), index.time_range(120, 60)
+            ('0b110', 0)
+        """
+        first = bisect_left(self.seconds, start)
+        last = bisect_left(self.seconds, end)
+        if last <= first:
+            return 0
+        return (1 << last) - (1 << first)
+
+    def count(self, query) -> int:
+        """Returns number of events matching the query
+
+        Args:
+            query: Query
+        """
+        return query.bitmap(self).bit_count()
+
+    def select(self, query):
+        """Yields events matching the query in time order
+
+        Args:
+            query: Query
+        """
+        # Bits as a string from the lowest event id up, set bits are found with str.find
+        bits = bin(query.bitmap(self))[:1:-1]
+        events = self._events
+        event_id = bits.find('1')
+        while event_id != -1:
+            yield events[event_id]
+            event_id = bits.find('1', event_id + 1)
+
+    def group_count(self, query, attribute:str) -> dict:
+        """Returns number of events matching the query per value of an attribute
+
+        Args:
+            query: Query
+            attribute: one of EventIndex.attributes
+
+        Returns:
+            dict {value: count}, values without matching events are left out
+        """
+        bitmap = query.bitmap(self)
+        counts = {}
+        for value, value_bitmap in self.bitmaps[attribute].items():
+            count = (bitmap & int.from_bytes(value_bitmap, 'little')).bit_count()
+            if count:
+                counts[value] = count
+        return counts
+
+class Query:
+    """Predicate on indexed event attributes
+
+    Keyword arguments are combined with AND. Queries are combined with
+    '&' (AND), '|' (OR) and '~' (NOT).
+    """
+
+    def __init__(self, **conditions):
+        """
+        Args:
+            conditions: attribute=value pairs, attributes as in EventIndex.attributes
+                and 'time' as (start, end) game seconds, end excluded
+        """
+        for attribute in conditions:
+            if attribute != 'time' and attribute not in EventIndex.attributes:
+                raise ValueError(f"Unknown attribute: {attribute}")
+        self.conditions = conditions
+
+    def bitmap(self, index:EventIndex) -> int:
+        """Returns bitmap of matching events in the index as int"""
+        bitmap = index.all()
+        for attribute, value in self.conditions.items():
+            if attribute == 'time':
+                bitmap &= index.time_range(*value)
+            else:
+                bitmap &= index.bitmap(attribute, value)
+        return bitmap
+
+    def __and__(self, other):
+        return _Combined(lambda index: self.bitmap(index) & other.bitmap(index))
+
+    def __or__(self, other):
+        return _Combined(lambda index: self.bitmap(index) | other.bitmap(index))
+
+    def __invert__(self):
+        return _Combined(lambda index: index.all() & ~self.bitmap(index))
+
+class _Combined(Query):
+    """Query combined from other queries"""
+
+    def __init__(self, combine):
+        self.conditions = {}
+        self.combine = combine
+
+    def bitmap(self, index:EventIndex) -> int:
+        return self.combine(index)
@@ -0,0 +1,226 @@
+# tilastoseuranta/rolling.py
+
+"""Rolling-window statistics updated in constant time
+
+Whole-game totals hide momentum. The windows in this module keep running
+sums next to a deque of recent values so that adding an event or advancing
+the game clock by one second costs O(1), no matter how long the game is.
+
+The module contains the following classes
+
+- 'LastPassesWindow' - pass % over the last N passes
+- 'TimePassWindow' - pass % over the last M seconds
+- 'PossessionWindow' - ball control share over the last M seconds
+- 'RollingStats' - rolling windows of both teams in a game
+"""
+
+from collections import deque
+
+# Window sizes of the app, also used in the ui column headers
+LAST_PASSES = 10 # passes in the pass count window
+WINDOW_SECONDS = 300 # length of the time windows in game seconds
+
+class LastPassesWindow:
+    """Pass % over the last N passes of a team"""
+
+    def __init__(self, size:int=10):
+        """
+        Args:
+            size: number of passes in the window
+
+        Attributes:
+            outcomes (deque): 1 for a pass to own team, otherwise 0
+            successful (int): running sum of outcomes in the window
+        """
+        self.outcomes = deque(maxlen=size)
+        self.successful = 0
+
+    def add(self, successful:bool):
+        """Adds a pass outcome, dropping the oldest one if the window is full
+
+        Examples:
+            >>> window = LastPassesWindow(3)
+            >>> for successful in [True, True, False]:
+            ...     window.add(successful)
+            >>> window.add(False)
+            >>> list(window.outcomes), window.successful
+            ([1, 0, 0], 1)
+
+        Args:
+            successful: True if the pass ended to own team
+        """
+        if len(self.outcomes) == self.outcomes.maxlen:
+            self.successful -= self.outcomes[0]
+        self.outcomes.append(int(successful))
+        self.successful += int(successful)
+
+    def pct(self) -> float:
+        """Returns share of successful passes in the window, 0 if no passes"""
+        try:
+            return self.successful / len(self.outcomes)
+        except ZeroDivisionError:
+            return 0
+
+class TimePassWindow:
+    """Pass % over the last M seconds of a team"""
+
+    def __init__(self, seconds:int=300):
+        """
+        Args:
+            seconds: length of the window in game seconds
+
+        Attributes:
+            seconds (int): length of the window
+            outcomes (deque): (second, outcome) pairs in time order
+            successful (int): running sum of outcomes in the window
+        """
+        self.seconds = seconds
+        self.outcomes = deque()
+        self.successful = 0
+
+    def add(self, second:int, successful:bool):
+        """Adds a pass outcome at given game second
+
+        Args:
+            second: game time in seconds when the pass was made
+            successful: True if the pass ended to own team
+        """
+        self.outcomes.append((second, int(successful)))
+        self.successful += int(successful)
+        self.advance(second)
+
+    def advance(self, second:int):
+        """Drops passes which are older than the window. Each pass is dropped once,
+        so the cost is amortized O(1) per pass.
+
+        Examples:
+            A pass made exactly window length ago is dropped
+
+            >>> window = TimePassWindow(60)
+            >>> window.add(10, True)
+            >>> window.add(20, False)
+            >>> window.advance(69)
+            >>> window.pct()
+            0.5
+            >>> window.advance(70)
+            >>> window.pct()
+            0.0
+
+        Args:
+            second: current game time in seconds
+        """
+        while self.outcomes and self.outcomes[0][0] <= second - self.seconds:
+            self.successful -= self.outcomes.popleft()[1]
+
+    def pct(self) -> float:
+        """Returns share of successful passes in the window, 0 if no passes"""
+        try:
+            return self.successful / len(self.outcomes)
+        except ZeroDivisionError:
+            return 0
+
+class PossessionWindow:
+    """Ball control seconds of each team over the last M seconds"""
+
+    def __init__(self, seconds:int=300):
+        """
+        Args:
+            seconds: length of the window in game seconds
+
+        Attributes:
+            samples (deque): team in ball control (or None) for each second in the window
+            seconds_in_control (dict): running count of seconds in the window per team
+        """
+        self.samples = deque(maxlen=seconds)
+        self.seconds_in_control = {}
+
+    def tick(self, ball_control_team):
+        """Records one game second of ball control
+
+        Examples:
+            >>> window = PossessionWindow(3)
+            >>> for team in ['home', 'home', 'away', None, 'away']:
+            ...     window.tick(team)
+            >>> list(window.samples), window.seconds_in_control
+            (['away', None, 'away'], {'home': 0, 'away': 2})
+            >>> window.share('away')
+            1.0
+
+        Args:
+            ball_control_team: team in ball control, None if neither
+        """
+        if len(self.samples) == self.samples.maxlen:
+            self._remove(self.samples[0])
+        self.samples.append(ball_control_team)
+        if ball_control_team is not None:
+            self.seconds_in_control[ball_control_team] = self.seconds_in_control.get(ball_control_team, 0) + 1
+
+    def _remove(self, ball_control_team):
+        if ball_control_team is not None:
+            self.seconds_in_control[ball_control_team] -= 1
+
+    def share(self, team) -> float:
+        """Returns ball control share of the team in the window, counting only
+        seconds when either team controlled the ball, 0 if neither did
+
+        Args:
+            team: team whose share is requested
+        """
+        try:
+            return self.seconds_in_control.get(team, 0) / sum(self.seconds_in_control.values())
+        except ZeroDivisionError:
+            return 0
+
+class RollingStats:
+    """Rolling windows of both teams in a game"""
+
+    def __init__(self, game, last_passes:int=LAST_PASSES, window_seconds:int=WINDOW_SECONDS):
+        """
+        Args:
+            game: game whose teams are followed
+            last_passes: number of passes in the pass count window (default: LAST_PASSES)
+            window_seconds: length of the time windows in seconds (default: WINDOW_SECONDS)
+
+        Attributes:
+            last_passes (dict): LastPassesWindow per team
+            recent_passes (dict): TimePassWindow per team
+            possession (PossessionWindow): ball control of both teams
+            clock (int): last game second recorded with tick
+        """
+        teams = [game.home_team, game.away_team]
+        self.last_passes = {team: LastPassesWindow(last_passes) for team in teams}
+        self.recent_passes = {team: TimePassWindow(window_seconds) for team in teams}
+        self.possession = PossessionWindow(window_seconds)
+        self.clock = 0
+
+    def add_pass(self, pass_transfer, second:int):
+        """Adds a pass to the windows of the passing team
+
+        Args:
+            pass_transfer: Pass event
+            second: game time in seconds when the pass was made
+        """
+        team = pass_transfer.passing_player.team
+        successful = pass_transfer.target == 1
+        self.last_passes[team].add(successful)
+        self.recent_passes[team].add(second, successful)
+
+    def tick(self, second:int, ball_control_team) -> bool:
+        """Advances the windows to game second. Seconds missed between two calls
+        are credited to the current ball control team, at most one window length.
+
+        Args:
+            second: current game time in seconds
+            ball_control_team: team in ball control, None if neither
+
+        Returns:
+            True if the clock advanced, otherwise False
+        """
+        if second <= self.clock:
+            return False
+        for _ in range(min(second - self.clock, self.possession.samples.maxlen)):
+            self.possession.tick(ball_control_team)
+        self.clock = second
+        for window in self.recent_passes.values():
+            window.advance(second)
+        return True
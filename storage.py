@@ -0,0 +1,259 @@
+# tilastoseuranta/storage.py
+
+"""SQLite persistence for games, teams, players and events
+
+Player identity inside a single 'Game' is only the "number - name" string
+read from the team json. The store gives each team and player a persistent
+id (team name, player number) so that statistics can be aggregated over
+several games without reloading them.
+
+The module contains the following classes
+
+- 'StatisticsStore' - SQLite store with bulk ingest and aggregate queries
+"""
+
+import sqlite3
+
+from classes import Game, Pass
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    team_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    team_id INTEGER NOT NULL REFERENCES teams(team_id),
+    player_number INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (team_id, player_number)
+);
+CREATE TABLE IF NOT EXISTS games (
+    game_id INTEGER PRIMARY KEY,
+    game_number INTEGER NOT NULL UNIQUE,
+    home_team_id INTEGER NOT NULL REFERENCES teams(team_id),
+    away_team_id INTEGER NOT NULL REFERENCES teams(team_id),
+    total_game_time INTEGER,
+    periods INTEGER
+);
+CREATE TABLE IF NOT EXISTS events (
+    event_id INTEGER PRIMARY KEY,
+    game_id INTEGER NOT NULL REFERENCES games(game_id),
+    sequence INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    gametime TEXT,
+    team_id INTEGER NOT NULL REFERENCES teams(team_id),
+    passing_player_id INTEGER NOT NULL REFERENCES players(player_id),
+    receiving_player_id INTEGER REFERENCES players(player_id),
+    target INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_events_game ON events (game_id, sequence);
+CREATE INDEX IF NOT EXISTS ix_events_team_target ON events (team_id, event_type, target);
+CREATE INDEX IF NOT EXISTS ix_events_player_target ON events (passing_player_id, event_type, target);
+"""
+
+# Queries are kept as constants so that sqlite3 reuses the prepared statement
+# from the connection's statement cache on every call
+INSERT_TEAM = "INSERT OR IGNORE INTO teams (name) VALUES (?)"
+SELECT_TEAM_ID = "SELECT team_id FROM teams WHERE name = ?"
+INSERT_PLAYER = """INSERT INTO players (team_id, player_number, name) VALUES (?, ?, ?)
+    ON CONFLICT (team_id, player_number) DO UPDATE SET name = excluded.name"""
+SELECT_PLAYER_IDS = "SELECT player_number, player_id FROM players WHERE team_id = ?"
+COUNT_GAME_EVENTS = "SELECT COUNT(*) FROM events WHERE game_id = (SELECT game_id FROM games WHERE game_number = ?)"
+DELETE_GAME_EVENTS = "DELETE FROM events WHERE game_id = (SELECT game_id FROM games WHERE game_number = ?)"
+INSERT_GAME = """INSERT INTO games (game_number, home_team_id, away_team_id, total_game_time, periods)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (game_number) DO UPDATE SET
+        home_team_id = excluded.home_team_id,
+        away_team_id = excluded.away_team_id,
+        total_game_time = excluded.total_game_time,
+        periods = excluded.periods"""
+SELECT_GAME_ID = "SELECT game_id FROM games WHERE game_number = ?"
+INSERT_EVENT = """INSERT INTO events
+    (game_id, sequence, event_type, gametime, team_id, passing_player_id, receiving_player_id, target)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+TEAM_PASS_TOTALS = """SELECT
+        COUNT(*),
+        COALESCE(SUM(e.target = 1), 0),
+        COALESCE(SUM(e.target = 0), 0),
+        COALESCE(SUM(e.target = 2), 0)
+    FROM events e JOIN teams t ON t.team_id = e.team_id
+    WHERE t.name = ? AND e.event_type = 'pass'"""
+PLAYER_PASS_TOTALS = """SELECT
+        p.player_number,
+        p.name,
+        COUNT(e.event_id),
+        COALESCE(SUM(e.target = 1), 0)
+    FROM players p
+    JOIN teams t ON t.team_id = p.team_id
+    LEFT JOIN events e ON e.passing_player_id = p.player_id AND e.event_type = 'pass'
+    WHERE t.name = ?
+    GROUP BY p.player_id
+    ORDER BY p.player_number"""
+
+class StatisticsStore:
+    """SQLite backed store for games and their events
+    """
+
+    def __init__(self, database:str=':memory:'):
+        """Opens (and creates if needed) the statistics database.
+
+        The connection is opened once and reused for every ingest and query.
+
+        Args:
+            database: path to the SQLite database file (default: in-memory database)
+
+        Attributes:
+            connection (sqlite3.Connection): open connection to the database
+        """
+        self.connection = sqlite3.connect(database)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Closes the database connection"""
+        self.connection.close()
+
+    def _team_id(self, team) -> int:
+        """Inserts team if it does not exist yet and returns its id"""
+        cursor = self.connection.cursor()
+        cursor.execute(INSERT_TEAM, (team.name,))
+        return cursor.execute(SELECT_TEAM_ID, (team.name,)).fetchone()[0]
+
+    def _player_ids(self, team, team_id:int) -> dict:
+        """Inserts players of the team and returns dict player number -> player id"""
+        cursor = self.connection.cursor()
+        cursor.executemany(
+            INSERT_PLAYER,
+            [(team_id, player.player_number, player.name) for player in team.players])
+        return dict(cursor.execute(SELECT_PLAYER_IDS, (team_id,)).fetchall())
+
+    def _ingest(self, game:Game, overwrite:bool=False):
+        """Writes one game without committing. Events of an already stored game
+        with the same game number are replaced.
+
+        Raises:
+            ValueError: if the game has no passes but the stored game has events
+                and overwrite is not set
+        """
+        cursor = self.connection.cursor()
+
+        if not game.passes and not overwrite:
+            stored_events = cursor.execute(COUNT_GAME_EVENTS, (game.game_number,)).fetchone()[0]
+            if stored_events:
+                raise ValueError(
+                    f"Game {game.game_number} has no passes, not replacing its {stored_events} stored events")
+
+        team_ids = {}
+        player_ids = {}
+        for team in [game.home_team, game.away_team]:
+            team_ids[team] = self._team_id(team)
+            for player_number, player_id in self._player_ids(team, team_ids[team]).items():
+                player_ids[(team, player_number)] = player_id
+
+        cursor.execute(DELETE_GAME_EVENTS, (game.game_number,))
+        cursor.execute(INSERT_GAME, (
+            game.game_number,
+            team_ids[game.home_team],
+            team_ids[game.away_team],
+            game.total_game_time,
+            game.periods))
+        game_id = cursor.execute(SELECT_GAME_ID, (game.game_number,)).fetchone()[0]
+
+        rows = []
+        for sequence, event in enumerate(game.events):
+            if not isinstance(event, Pass):
+                continue
+            passing_team = event.passing_player.team
+            if event.receiving_player == 'out':
+                receiving_player_id = None
+            else:
+                receiving_player = event.receiving_player
+                receiving_player_id = player_ids[(receiving_player.team, receiving_player.player_number)]
+            rows.append((
+                game_id,
+                sequence,
+                'pass',
+                event.gametime,
+                team_ids[passing_team],
+                player_ids[(passing_team, event.passing_player.player_number)],
+                receiving_player_id,
+                event.target))
+        cursor.executemany(INSERT_EVENT, rows)
+
+    def save_game(self, game:Game, overwrite:bool=False):
+        """Saves game, its teams, players and events in a single transaction
+
+        Args:
+            game: game to be saved
+            overwrite: replace stored events of the game even if the game has
+                no passes (default: False)
+        """
+        self.save_games([game], overwrite)
+
+    def save_games(self, games:list, overwrite:bool=False):
+        """Bulk saves games in a single transaction
+
+        A game without passes does not replace a stored game with events
+        unless overwrite is set, and then nothing of the batch is saved.
+
+        Examples:
+            >>> from classes import GameEvent
+            >>> store = StatisticsStore()
+            >>> game = Game('game.json')
+            >>> game.add_event(Pass(GameEvent('00:10', game.home_team.players[0]), game.home_team.players[1]))
+            >>> store.save_game(game)
+            >>> store.save_game(Game('game.json'))
+            Traceback (most recent call last):
+                ...
+            ValueError: Game 12345 has no passes, not replacing its 1 stored events
+            >>> store.save_game(Game('game.json'), overwrite=True)
+            >>> store.team_pass_totals(game.home_team.name)
+            (0, 0, 0, 0)
+
+        Args:
+            games: list of games (Game) to be saved
+            overwrite: replace stored events of games without passes (default: False)
+
+        Raises:
+            ValueError: if a game has no passes but its stored game has events
+                and overwrite is not set
+        """
+        with self.connection:
+            for game in games:
+                self._ingest(game, overwrite)
+
+    def team_pass_totals(self, team_name:str) -> tuple:
+        """Returns pass totals of a team over all stored games
+
+        Examples:
+            >>> from classes import GameEvent
+            >>> store = StatisticsStore()
+            >>> game = Game('game.json')
+            >>> passer, receiver = game.home_team.players[:2]
+            >>> game.add_event(Pass(GameEvent('00:10', passer), receiver))
+            >>> game.add_event(Pass(GameEvent('00:15', receiver), 'out'))
+            >>> game.add_event(Pass(GameEvent('00:20', passer), game.away_team.players[0]))
+            >>> store.save_game(game)
+            >>> store.team_pass_totals(game.home_team.name)
+            (3, 1, 1, 1)
+
+        Args:
+            team_name: name of the team
+
+        Returns:
+            tuple (passes, to own team, to opponent, out of field)
+        """
+        return self.connection.execute(TEAM_PASS_TOTALS, (team_name,)).fetchone()
+
+    def player_pass_totals(self, team_name:str) -> list:
+        """Returns pass totals of each player of a team over all stored games
+
+        Args:
+            team_name: name of the team
+
+        Returns:
+            list of tuples (player number, name, passes, successful passes) ordered by player number
+        """
+        return self.connection.execute(PLAYER_PASS_TOTALS, (team_name,)).fetchall()
@@ -0,0 +1,215 @@
+# tilastoseuranta/timeseries.py
+
+"""Time series of game statistics sampled once per game second
+
+Samples are kept in a fixed size ring buffer of typed arrays, so memory does
+not grow during the game. For the live chart the samples are reduced to
+min/max/mean buckets as they arrive, and only a finished bucket is drawn on
+the canvas; points already drawn are never redrawn.
+
+The module contains the following classes
+
+- 'RingBuffer' - fixed memory buffer of per-second samples
+- 'BucketAggregator' - incremental min/max/mean downsampling of one channel
+- 'LiveChart' - chart on a tkinter Canvas drawn one bucket at a time
+"""
+
+import csv
+from array import array
+from math import ceil
+
+class RingBuffer:
+    """Fixed capacity buffer of samples, the oldest sample is overwritten when full"""
+
+    def __init__(self, capacity:int, channels:list):
+        """
+        Args:
+            capacity: maximum number of samples
+            channels: names of the sampled statistics
+
+        Attributes:
+            capacity (int): maximum number of samples
+            channels (list): names of the sampled statistics
+            seconds (array): game second of each sample
+            values (dict): array of sample values per channel
+            start (int): index of the oldest sample
+            length (int): number of samples in the buffer
+        """
+        self.capacity = capacity
+        self.channels = list(channels)
+        self.seconds = array('l', [0] * capacity)
+        self.values = {channel: array('d', [0.0] * capacity) for channel in self.channels}
+        self.start = 0
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def append(self, second:int, values:dict):
+        """Adds a sample
+
+        Args:
+            second: game time in seconds
+            values: value of each channel
+        """
+        index = (self.start + self.length) % self.capacity
+        self.seconds[index] = second
+        for channel in self.channels:
+            self.values[channel][index] = values[channel]
+
+        if self.length < self.capacity:
+            self.length += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def _ordered(self, data:array) -> list:
+        """Returns data of the buffer from the oldest to the newest sample"""
+        end = self.start + self.length
+        if end <= self.capacity:
+            return data[self.start:end].tolist()
+        return data[self.start:].tolist() + data[:end - self.capacity].tolist()
+
+    def series(self, channel:str) -> list:
+        """Returns samples of a channel from the oldest to the newest
+
+        Args:
+            channel: name of the statistic
+        """
+        return self._ordered(self.values[channel])
+
+    def rows(self) -> list:
+        """Returns all samples as rows (second, value of each channel)
+
+        Examples:
+            >>> buffer = RingBuffer(3, ['pass_pct'])
+            >>> for second in range(5):
+            ...     buffer.append(second, {'pass_pct': second / 10})
+            >>> buffer.rows()
+            [(2, 0.2), (3, 0.3), (4, 0.4)]
+        """
+        return list(zip(self._ordered(self.seconds), *[self.series(channel) for channel in self.channels]))
+
+    def downsample(self, channel:str, buckets:int) -> list:
+        """Reduces samples of a channel to equal sized buckets
+
+        Args:
+            channel: name of the statistic
+            buckets: maximum number of buckets
+
+        Returns:
+            list of (min, max, mean) tuples, one per bucket
+        """
+        samples = self.series(channel)
+        size = max(1, ceil(len(samples) / buckets))
+        return [
+            (min(bucket), max(bucket), sum(bucket) / len(bucket))
+            for bucket in (samples[i:i + size] for i in range(0, len(samples), size))]
+
+    def export_csv(self, path:str):
+        """Writes all samples to a csv file with a header row
+
+        Args:
+            path: path of the csv file
+        """
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['second'] + self.channels)
+            writer.writerows(self.rows())
+
+class BucketAggregator:
+    """Min/max/mean of one channel in consecutive buckets of game seconds"""
+
+    def __init__(self, bucket_seconds:int):
+        """
+        Args:
+            bucket_seconds: length of a bucket in seconds
+
+        Attributes:
+            bucket_seconds (int): length of a bucket in seconds
+            bucket (int): index of the open bucket, None before the first sample
+        """
+        self.bucket_seconds = bucket_seconds
+        self.bucket = None
+        self._reset()
+
+    def _reset(self):
+        self.minimum = None
+        self.maximum = None
+        self.total = 0
+        self.count = 0
+
+    def add(self, second:int, value:float):
+        """Adds a sample to the open bucket
+
+        Args:
+            second: game time in seconds
+            value: sample value
+
+        Returns:
+            (bucket, min, max, mean) of the bucket which was closed by the sample, otherwise None
+        """
+        bucket = second // self.bucket_seconds
+        closed = None
+        if self.bucket is not None and bucket != self.bucket and self.count:
+            closed = (self.bucket, self.minimum, self.maximum, self.total / self.count)
+            self._reset()
+        self.bucket = bucket
+
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.total += value
+        self.count += 1
+        return closed
+
+class LiveChart:
+    """Line chart of channels with values between 0 and 1 on a Canvas"""
+
+    bucket_width = 4 # pixels per bucket
+
+    def __init__(self, canvas, total_seconds:int, colors:dict):
+        """
+        Args:
+            canvas: tkinter Canvas to draw on
+            total_seconds: seconds fitted to the canvas width, later samples are not drawn
+            colors: line color per channel
+
+        Attributes:
+            canvas (Canvas): canvas to draw on
+            colors (dict): line color per channel
+            aggregators (dict): BucketAggregator per channel
+            previous (dict): (x, y) of the previous mean point per channel
+        """
+        self.canvas = canvas
+        self.width = int(canvas.cget('width'))
+        self.height = int(canvas.cget('height'))
+        self.colors = colors
+
+        bucket_seconds = max(1, ceil(total_seconds / max(1, self.width // self.bucket_width)))
+        self.aggregators = {channel: BucketAggregator(bucket_seconds) for channel in colors}
+        self.previous = {}
+
+    def _y(self, value:float) -> float:
+        return self.height - value * self.height
+
+    def add(self, second:int, values:dict):
+        """Adds a sample and draws buckets which were closed by it
+
+        Args:
+            second: game time in seconds
+            values: value of each channel
+        """
+        for channel, aggregator in self.aggregators.items():
+            closed = aggregator.add(second, values[channel])
+            if closed:
+                self._draw(channel, *closed)
+
+    def _draw(self, channel:str, bucket:int, minimum:float, maximum:float, mean:float):
+        """Draws min-max range and mean segment of one bucket"""
+        x = bucket * self.bucket_width + self.bucket_width / 2
+        if x > self.width:
+            return
+        color = self.colors[channel]
+        self.canvas.create_line(x, self._y(minimum), x, self._y(maximum) - 1, fill=color, stipple='gray50')
+        if channel in self.previous:
+            self.canvas.create_line(*self.previous[channel], x, self._y(mean), fill=color)
+        self.previous[channel] = (x, self._y(mean))
@@ -13,6 +13,7 @@ from tkinter import ttk
 import re
 
 from classes import Game
+from rolling import LAST_PASSES, WINDOW_SECONDS
 
 root = Tk()
 root.title("Tilastoseuranta")
@@ -159,11 +160,9 @@ f_right.grid(column=1, row=0)
 f_pass_players = ttk.Frame(master=f_right, borderwidth=5, relief='ridge')
 f_pass_players.grid(column=0, row=0)
 
-l_players_text_home = ttk.Label(f_pass_players, text="Home team players")
-l_players_text_away = ttk.Label(f_pass_players, text="Away team players")
-
-l_players_text_home.grid(column=0, row=0)
-l_players_text_away.grid(column=0, row=2)
+# Players of both teams are drawn on the canvas by playergrid.PlayerGrid
+c_player_grid = Canvas(f_pass_players, highlightthickness=0)
+c_player_grid.grid(column=0, row=0)
 
 for child in f_right.winfo_children():
     child.grid_configure(padx=5, pady=5)
@@ -189,11 +188,19 @@ pass_stats_percentage_home = StringVar()
 pass_stats_percentage_away = StringVar()
 pass_stats_longest_pass_chain_home = StringVar()
 pass_stats_longest_pass_chain_away = StringVar()
+pass_stats_last_passes_percentage_home = StringVar() # pass % of the last passes
+pass_stats_last_passes_percentage_away = StringVar()
+pass_stats_recent_percentage_home = StringVar() # pass % of the last minutes
+pass_stats_recent_percentage_away = StringVar()
 #### --- Variables ENDS
 
 #### --- Pass stats texts STARTS
 ttk.Label(f_pass_stats, text="Kotijoukkue").grid(column=1, row=0, sticky=W)
 ttk.Label(f_pass_stats, text="Vierasjoukkue").grid(column=2, row=0, sticky=W)
+ttk.Label(f_pass_stats, text=f"Koti ({LAST_PASSES} syöttöä)").grid(column=3, row=0, sticky=W)
+ttk.Label(f_pass_stats, text=f"Vieras ({LAST_PASSES} syöttöä)").grid(column=4, row=0, sticky=W)
+ttk.Label(f_pass_stats, text=f"Koti ({WINDOW_SECONDS // 60} min)").grid(column=5, row=0, sticky=W)
+ttk.Label(f_pass_stats, text=f"Vieras ({WINDOW_SECONDS // 60} min)").grid(column=6, row=0, sticky=W)
 
 ttk.Label(f_pass_stats, text="Syötöt omille").grid(column=0, row=1, sticky=W)
 ttk.Label(f_pass_stats, text="Syötöt vastustajalle").grid(column=0, row=2, sticky=W)
@@ -216,6 +223,14 @@ l_pass_stats_percentage_home = ttk.Label(f_pass_stats, textvariable=pass_stats_p
 l_pass_stats_percentage_home.grid(column=1, row=3, sticky=W)
 l_pass_stats_percentage_away = ttk.Label(f_pass_stats, textvariable=pass_stats_percentage_away)
 l_pass_stats_percentage_away.grid(column=2, row=3, sticky=W)
+l_pass_stats_last_passes_percentage_home = ttk.Label(f_pass_stats, textvariable=pass_stats_last_passes_percentage_home)
+l_pass_stats_last_passes_percentage_home.grid(column=3, row=3, sticky=W)
+l_pass_stats_last_passes_percentage_away = ttk.Label(f_pass_stats, textvariable=pass_stats_last_passes_percentage_away)
+l_pass_stats_last_passes_percentage_away.grid(column=4, row=3, sticky=W)
+l_pass_stats_recent_percentage_home = ttk.Label(f_pass_stats, textvariable=pass_stats_recent_percentage_home)
+l_pass_stats_recent_percentage_home.grid(column=5, row=3, sticky=W)
+l_pass_stats_recent_percentage_away = ttk.Label(f_pass_stats, textvariable=pass_stats_recent_percentage_away)
+l_pass_stats_recent_percentage_away.grid(column=6, row=3, sticky=W)
 
 l_pass_stats_longest_pass_chain_home = ttk.Label(f_pass_stats, textvariable=pass_stats_longest_pass_chain_home)
 l_pass_stats_longest_pass_chain_home.grid(column=1, row=4, sticky=W)
@@ -234,6 +249,8 @@ bc_timer_away_team = StringVar()
 bc_timer_neither = StringVar()
 bc_pc_home_team = StringVar()
 bc_pc_away_team = StringVar()
+bc_pc_recent_home_team = StringVar() # ball control % of the last minutes
+bc_pc_recent_away_team = StringVar()
 #### --- Variables ENDS
 
 ttk.Label(f_ball_control_stats, text="Pallonhallinta").grid(row=0, column=0, columnspan=4, sticky=W)
@@ -243,6 +260,7 @@ ttk.Label(f_ball_control_stats, text="Ei kumpikaan").grid(row=1, column=3)
 
 ttk.Label(f_ball_control_stats, text="Pallonhallinta-aika").grid(column=0, row=2, sticky=W)
 ttk.Label(f_ball_control_stats, text="Pallonhallinta-%").grid(column=0, row=3, sticky=W)
+ttk.Label(f_ball_control_stats, text=f"Pallonhallinta-% ({WINDOW_SECONDS // 60} min)").grid(column=0, row=4, sticky=W)
 
 #### --- Ball control timers STARTS
 l_home_team_bc_timer = ttk.Label(f_ball_control_stats, textvariable=bc_timer_home_team)
@@ -251,6 +269,8 @@ l_neather_bc_timer = ttk.Label(f_ball_control_stats, textvariable=bc_timer_neith
 
 l_home_team_bc_pc = ttk.Label(f_ball_control_stats, textvariable=bc_pc_home_team)
 l_away_team_bc_pc = ttk.Label(f_ball_control_stats, textvariable=bc_pc_away_team)
+l_home_team_bc_pc_recent = ttk.Label(f_ball_control_stats, textvariable=bc_pc_recent_home_team)
+l_away_team_bc_pc_recent = ttk.Label(f_ball_control_stats, textvariable=bc_pc_recent_away_team)
 
 l_home_team_bc_timer.grid(column=1, row=2)
 l_away_team_bc_timer.grid(column=2, row=2)
@@ -258,8 +278,15 @@ l_neather_bc_timer.grid(column=3, row=2)
 
 l_home_team_bc_pc.grid(column=1, row=3)
 l_away_team_bc_pc.grid(column=2, row=3)
+l_home_team_bc_pc_recent.grid(column=1, row=4)
+l_away_team_bc_pc_recent.grid(column=2, row=4)
 #### --- Ball control timers ENDS
 ### --- Ball control stats ENDS
+
+### --- Statistics chart STARTS
+c_stats_chart = Canvas(f_bottom, width=480, height=120, background='white')
+c_stats_chart.grid(column=0, row=1, sticky=W)
+### --- Statistics chart ENDS
 ## --- Frame bottom ENDS
 
 def update_pass_transfer_stats(game:Game):
@@ -272,25 +299,42 @@ def update_pass_transfer_stats(game:Game):
     for team in [game.home_team, game.away_team]:
         
         pass_code_to_own = team.code() + "1"
-        pass_code_to_opponent = team.code() + "0"
-        pass_code_to_out = team.code() + "2"
         
         s, longest = game.passing_chains(pass_code_to_own)
 
-        pass_codes = [p.code() for p in team.get_passes()]
+        target_counts = game.pass_target_counts(team)
+        passes_to_own = target_counts.get(1, 0)
+        passes_not_to_own = target_counts.get(0, 0) + target_counts.get(2, 0)
 
         try:
-            team.pass_transfer_pct = pass_codes.count(pass_code_to_own) / len(pass_codes)
+            team.pass_transfer_pct = passes_to_own / (passes_to_own + passes_not_to_own)
         except ZeroDivisionError:
             team.pass_transfer_pct = 0
         
         if team == game.home_team:
-            pass_stats_own_home.set(f"{pass_codes.count(pass_code_to_own)}")
-            pass_stats_not_own_home.set(f"{pass_codes.count(pass_code_to_opponent) + pass_codes.count(pass_code_to_out)}")
+            pass_stats_own_home.set(f"{passes_to_own}")
+            pass_stats_not_own_home.set(f"{passes_not_to_own}")
             pass_stats_percentage_home.set(f"{team.pass_transfer_pct:.1%}")
             pass_stats_longest_pass_chain_home.set(f"{longest}")
         elif team == game.away_team:
-            pass_stats_own_away.set(f"{pass_codes.count(pass_code_to_own)}")
-            pass_stats_not_own_away.set(f"{pass_codes.count(pass_code_to_opponent) + pass_codes.count(pass_code_to_out)}")
+            pass_stats_own_away.set(f"{passes_to_own}")
+            pass_stats_not_own_away.set(f"{passes_not_to_own}")
             pass_stats_percentage_away.set(f"{team.pass_transfer_pct:.1%}")
-            pass_stats_longest_pass_chain_away.set(f"{longest}")
\ No newline at end of file
+            pass_stats_longest_pass_chain_away.set(f"{longest}")
+
+def update_rolling_stats(game:Game):
+    """Updates rolling-window pass and ball control stats in ui
+
+    Args:
+        game: game object with rolling_stats (rolling.RollingStats)
+    """
+
+    rolling_stats = game.rolling_stats
+
+    pass_stats_last_passes_percentage_home.set(f"{rolling_stats.last_passes[game.home_team].pct():.1%}")
+    pass_stats_last_passes_percentage_away.set(f"{rolling_stats.last_passes[game.away_team].pct():.1%}")
+    pass_stats_recent_percentage_home.set(f"{rolling_stats.recent_passes[game.home_team].pct():.1%}")
+    pass_stats_recent_percentage_away.set(f"{rolling_stats.recent_passes[game.away_team].pct():.1%}")
+
+    bc_pc_recent_home_team.set(f"{rolling_stats.possession.share(game.home_team):.0%}")
+    bc_pc_recent_away_team.set(f"{rolling_stats.possession.share(game.away_team):.0%}")
\ No newline at end of file